@@ -1,7 +1,10 @@
+from modules.StartupTimeline import startup_timeline
+
 import pygame
 import os
 import sys
-import json
+import time
+import multiprocessing
 
 from modules.AnimationObject import AnimationObject
 from modules.HoverButton import HoverButton
@@ -9,48 +12,212 @@ from modules.MenuButton import MenuButton
 from modules.InvisibleButton import InvisibleButton
 from modules.Button import Button
 from modules.Checkbox import Checkbox
-from modules.Panel import Panel
+from modules.LayeredPanel import LayeredPanel
 from modules.Text import Text
-
-pygame.init()
+from modules.AssetCache import asset_cache
+from modules.AssetPack import asset_pack
+from modules.AssetLoader import AssetLoader
+from modules.AssetManager import asset_manager
+from modules.Renderer import Renderer
+from modules.Profiler import Profiler
+from modules.FrameClock import FrameClock
+from modules.InputDispatcher import InputDispatcher
+from modules.SoundBank import sound_bank
+from modules.StaticGenerator import StaticGenerator
+from modules.SaveManager import SaveManager
+from modules.NightSimulation import NightSimulation
+from modules.PanoramaView import PanoramaView
+from modules.CameraSystem import CameraSystem
+from modules.FontCache import font_cache
+from pygame._sdl2.video import Window, WINDOWPOS_CENTERED
+
+startup_timeline.mark('import')
+
+def init_pygame():
+    pygame.display.init()
+    pygame.font.init()
+
+def init_mixer():
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"Something went wrong while opening the audio device, sound is disabled: {e}")
 
 def resource_path(relative_path):
     base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base_path, relative_path)
 
+def data_path(relative_path):
+    if getattr(sys, 'frozen', False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, relative_path)
+
 class Game:
+    MENU_ASSETS = [
+        ("assets/main_menu_background.png", 'auto'),
+    ]
+
+    STATIC_ASSETS = [(f"assets/static{i}.png" if i > 1 else "assets/static.png", 'auto') for i in range(1, 6)]
+
+    GAME_ASSETS = [
+        ("assets/ui_atlas.png", True),
+        ("assets/office.png", 'auto'),
+        ("assets/office_door.png", 'auto'),
+        ("assets/office_front_vent.png", 'auto'),
+        ("assets/office_right_vent.png", 'auto'),
+    ] + [(f"assets/c_anim{i}.png", True) for i in range(1, 12)]
+
+    CONFIG_DEFAULTS = {
+        "options": [{"WIDTH": 1920, "HEIGHT": 1080}, {"FULLSCREEN": 1}, {"VOLUME": 0.05}],
+    }
+
+    SAVE_DEFAULTS = {
+        "stars": 0,
+        "night": 1,
+        "custom_night": {"levels": {}},
+    }
+
+    CAMERAS = [
+        {'name': 'CAM 1A', 'room': 'stage', 'map': (1590, 600)},
+        {'name': 'CAM 1B', 'room': 'dining_area', 'map': (1590, 700)},
+        {'name': 'CAM 5', 'room': 'backstage', 'map': (1440, 700)},
+        {'name': 'CAM 6', 'room': 'kitchen', 'map': (1740, 700)},
+        {'name': 'CAM 2A', 'room': 'west_hall', 'map': (1500, 820)},
+        {'name': 'CAM 4A', 'room': 'east_hall', 'map': (1680, 820)},
+        {'name': 'CAM 3', 'room': 'vent_shaft', 'map': (1780, 900)},
+    ]
+    CAMERA_FALLBACK = "assets/cam1.png"
+    CAMERA_FLIP_MS = 260
+    CAMERA_FEED_BUDGET = 48 * 1048576
+
+    HOURS = ['12 AM', '1 AM', '2 AM', '3 AM', '4 AM', '5 AM', '6 AM']
+
+    PANORAMA_STRENGTH = 0.15
+    PANORAMA_QUALITY = 0.5
+    PANORAMA_MOTION_QUALITY = 0.25
+
+    LOADER_WORKERS = None
+    LOADER_MODE = 'thread'
+
+    LOGICAL_RESOLUTION = (1920, 1080)
+    USE_LOGICAL_DISPLAY = False
+
+    SOUND_CATEGORIES = [
+        ('ui', 2, 60, 1.0),
+        ('camera', 2, 0, 1.0),
+        ('sfx', 6, 0, 1.0),
+        ('jumpscare', 1, 0, 1.0),
+    ]
+
     def __init__(self) -> None:
+        init_pygame()
+        startup_timeline.mark('init')
+
         self.state = 'MainMenu'
+        self.startup_report = '--startup-report' in sys.argv
+
+        self.loader = AssetLoader(workers=self.LOADER_WORKERS, mode=self.LOADER_MODE)
+        self.saves = SaveManager()
+        self.logical_display = self.USE_LOGICAL_DISPLAY
+        self.RESOLUTION = None
+        self.dispatcher = InputDispatcher()
+        self.profiler = None
+
+        self.night_sim = None
+        self.night_started = False
+        self.custom_night = False
 
         self.init_game()
         self.init_main_menu()
-        self.init_options()
 
         self.update()
 
 
+    def get_config_path(self):
+        return data_path("config.json")
+
+
+    def get_save_path(self):
+        return data_path("save.json")
+
+
+    def get_font_paths_path(self):
+        return data_path("fonts.json")
+
+
+    def load_data(self):
+        return self.saves.load(self.get_config_path(), self.CONFIG_DEFAULTS, resource_path("config.json"))
+
+
+    def load_progress(self):
+        progress = self.saves.load(self.get_save_path(), self.SAVE_DEFAULTS)
+
+        self.stars = progress['stars']
+        self.night = max(1, progress['night'])
+        self.custom_night_levels = progress['custom_night']['levels']
+
+
+    def save_progress(self):
+        self.saves.save(self.get_save_path(), {
+            "stars": self.stars,
+            "night": self.night,
+            "custom_night": {"levels": self.custom_night_levels},
+        })
+
+
     def init_game(self):
-        with open(resource_path("config.json"), "r") as f:
-            self.data = json.load(f)
+        self.data = self.load_data()
 
         self.data_resolution = self.data['options'][0]
         self.data_fullscreen = self.data['options'][1]
         self.data_volume = self.data['options'][2]
 
-        self.RESOLUTION = (self.data_resolution['WIDTH'], self.data_resolution['HEIGHT'])
+        self.window_resolution = (self.data_resolution['WIDTH'], self.data_resolution['HEIGHT'])
 
-        if self.data_fullscreen["FULLSCREEN"] == 1:
-            self.screen = pygame.display.set_mode(self.RESOLUTION, pygame.FULLSCREEN)
-        else:
-            self.screen = pygame.display.set_mode(self.RESOLUTION)
+        self.init_display()
+
+        if os.path.exists(resource_path("assets.pack")) and asset_pack.open(resource_path("assets.pack")):
+            asset_cache.set_pack(asset_pack)
 
-        self.icon = pygame.image.load(resource_path('assets/icon.png'))
+        self.icon = asset_cache.load_raw(resource_path('assets/icon.png'))
 
         pygame.display.set_caption("FNaF 7 Python")
         pygame.display.set_icon(self.icon)
 
+        self.draw_splash()
+        startup_timeline.mark('first_frame')
+
+        font_cache.load_paths(self.get_font_paths_path())
+        init_mixer()
+
+        asset_cache.set_directory(data_path("cache"))
+        try:
+            asset_cache.prune()
+        except Exception as e:
+            print(f"Something went wrong while pruning the asset cache: {e}")
+
+        try:
+            asset_manager.add_atlas(resource_path("assets/ui_atlas.json"))
+        except:
+            print("Something went wrong while loading the UI atlas, falling back to separate images")
+
+        try:
+            asset_manager.add_optimized(resource_path("assets/optimized.json"))
+        except:
+            print("Something went wrong while loading the optimized asset index, using the original images")
+
+        for name, voices, cooldown, volume in self.SOUND_CATEGORIES:
+            sound_bank.add_category(name, voices, cooldown, volume)
+        sound_bank.set_volume(self.data_volume['VOLUME'])
+
+        self.procedural_static = StaticGenerator.is_available()
+
         self.fps = 144
-        self.clock = pygame.time.Clock()
+        self.tick_rate = 144
+        self.clock = FrameClock(self.tick_rate, self.fps)
+        self.max_wait_ms = 100
 
         self.done = False
 
@@ -58,29 +225,139 @@ class Game:
 
         self.offset_x = float(float(self.RESOLUTION[0]) / 1920.0)
 
-        self.speed_x = 10
+        self.scroll_speed = 1440
+        self.speed_x = self.scroll_speed / self.tick_rate
+
+        self.office_x = 0.0
+        self.previous_office_x = 0.0
+        self.last_mouse = None
+
+        self.pending_resolution = None
+
+        self.loaded_states = set()
+        self.loader.reset()
+        self.loader.register('Game', self.get_manifest(self.GAME_ASSETS), self.get_scale())
+
+        self.loading_text = Text(860, 510, 'Arial', 62, "Loading...", (255,255,255), self.RESOLUTION)
+
+
+    def draw_splash(self):
+        self.screen.fill((0,0,0))
+        self.screen.blit(self.icon, self.icon.get_rect(center=self.screen.get_rect().center))
+        pygame.display.flip()
+        pygame.event.pump()
+
+
+    def finish_startup(self):
+        startup_timeline.mark('menu_ready')
+
+        if font_cache.paths_changed:
+            self.saves.save(self.get_font_paths_path(), font_cache.get_paths())
+
+        if self.startup_report:
+            startup_timeline.print_report()
+            startup_timeline.dump(data_path("startup.json"), resource_path(""))
+            self.done = True
+
+
+    def init_display(self):
+        flags = pygame.FULLSCREEN if self.data_fullscreen["FULLSCREEN"] == 1 else 0
+
+        if self.logical_display and self.init_logical_display(flags):
+            self.RESOLUTION = self.LOGICAL_RESOLUTION
+        elif self.logical_display and self.RESOLUTION == self.LOGICAL_RESOLUTION:
+            self.screen = pygame.display.set_mode(self.RESOLUTION, flags)
+        else:
+            self.logical_display = False
+            self.RESOLUTION = self.window_resolution
+            self.screen = pygame.display.set_mode(self.RESOLUTION, flags)
+
+        self.renderer = Renderer(self.screen)
+        self.last_state = None
+        self.last_office_view = None
+
+        if self.profiler is not None:
+            self.profiler.wrap(self.renderer, 'present', 'display_update')
+
 
+    def init_logical_display(self, flags):
+        try:
+            self.screen = pygame.display.set_mode(self.LOGICAL_RESOLUTION, flags | pygame.SCALED)
+        except pygame.error:
+            os.environ['SDL_RENDER_DRIVER'] = 'software'
+            try:
+                self.screen = pygame.display.set_mode(self.LOGICAL_RESOLUTION, flags | pygame.SCALED)
+            except pygame.error as e:
+                print(f"Something went wrong while creating the scaled display, falling back to scaled assets: {e}")
+                return False
+
+        if not flags & pygame.FULLSCREEN:
+            self.resize_window(self.window_resolution)
+        return True
+
+
+    def resize_window(self, resolution):
+        try:
+            window = Window.from_display_module()
+            window.size = resolution
+            window.position = WINDOWPOS_CENTERED
+        except pygame.error as e:
+            print(f"Something went wrong while resizing the window: {e}")
+
+
+    def set_logical_fullscreen(self):
+        try:
+            pygame.display.toggle_fullscreen()
+        except pygame.error:
+            self.init_display()
+            return None
+
+        if self.data_fullscreen["FULLSCREEN"] == 0:
+            self.resize_window(self.window_resolution)
+        self.renderer.mark_all()
+
+
+    def get_scale(self, resolution = None):
+        resolution = resolution or self.RESOLUTION
+        return (float(float(resolution[0]) / 1920.0), float(float(resolution[1]) / 1080.0))
+
+
+    def get_manifest(self, assets):
+        manifest = []
+        for source, alpha in assets:
+            image, _, alpha = asset_manager.get_optimized(resource_path(source), alpha)
+            manifest.append((image, alpha))
+        return manifest
+
+
+    def init_office(self):
         self.cam_button = HoverButton(660, 1020, 600, 60, resource_path("assets/cam_button.png"), self.RESOLUTION)
         
-        self.office = Panel(0, 0, 1920, 1080, resource_path("assets/office.png"), self.RESOLUTION)
+        self.office = LayeredPanel(0, 0, 1920, 1080, resource_path("assets/office.png"), self.RESOLUTION)
 
-        self.office_door = Panel(0, 0, 1920, 1080, resource_path("assets/office_door.png"), self.RESOLUTION)
+        self.office.add_variant('door', resource_path("assets/office_door.png"))
         self.office_door_button = InvisibleButton(360,120,290,820, self.RESOLUTION)
 
-        self.office_front_vent = Panel(0, 0, 1920, 1080, resource_path("assets/office_front_vent.png"), self.RESOLUTION)
+        self.office.add_variant('front_vent', resource_path("assets/office_front_vent.png"))
         self.office_front_vent_button = InvisibleButton(1115, 250, 435, 260, self.RESOLUTION)
 
-        self.office_right_vent = Panel(0, 0, 1920, 1080, resource_path("assets/office_right_vent.png"), self.RESOLUTION)
+        self.office.add_variant('right_vent', resource_path("assets/office_right_vent.png"))
         self.office_right_vent_button = InvisibleButton(2060, 560, 150, 400, self.RESOLUTION)
 
+        self.panorama = None
+        if PanoramaView.is_available():
+            self.panorama = PanoramaView(self.RESOLUTION, self.PANORAMA_STRENGTH, self.PANORAMA_QUALITY, self.PANORAMA_MOTION_QUALITY)
+            self.dispatcher.set_scroll_transform(self.panorama.unwarp)
 
-        self.cam1 = Panel(0, 0, 1920, 1080, resource_path("assets/cam1.png"), self.RESOLUTION)
+        self.cam_static = None
+        if self.procedural_static:
+            self.cam_static = StaticGenerator(0, 0, 1920, 1080, self.RESOLUTION, 60, intensity=0.8, scanlines=0.5, roll=0.5, alpha=40)
 
-        self.office_door.set_visible(False)
-        self.office_front_vent.set_visible(False)
-        self.office_right_vent.set_visible(False)
+        self.hour_text = Text(1680, 30, 'Arial', 48, self.HOURS[0], (255,255,255), self.RESOLUTION)
+        self.night_text = Text(1680, 90, 'Arial', 32, "", (255,255,255), self.RESOLUTION)
+        self.power_text = Text(40, 1010, 'Arial', 40, "Power: 100%", (255,255,255), self.RESOLUTION)
 
-        self.cam_anim = AnimationObject(0, 0, 100, self.RESOLUTION)
+        self.cam_anim = AnimationObject(0, 0, self.CAMERA_FLIP_MS // 11, self.RESOLUTION)
         self.cam_anim.append_frames(resource_path("assets/c_anim1.png"))
         self.cam_anim.append_frames(resource_path("assets/c_anim2.png"))
         self.cam_anim.append_frames(resource_path("assets/c_anim3.png"))
@@ -93,47 +370,122 @@ class Game:
         self.cam_anim.append_frames(resource_path("assets/c_anim10.png"))
         self.cam_anim.append_frames(resource_path("assets/c_anim11.png"))
 
+        self.cameras = CameraSystem(self.get_cameras(), self.cam_anim, self.RESOLUTION, self.CAMERA_FEED_BUDGET)
+        self.set_game_widgets()
+
+        self.loaded_states.add('Game')
+
+
+    def set_game_widgets(self):
+        self.camera_widgets_up = self.cameras.is_up()
+        widgets = [self.cam_button] + (self.cameras.buttons if self.camera_widgets_up else [])
+        self.dispatcher.set_widgets('Game', widgets, [self.office_door_button, self.office_front_vent_button, self.office_right_vent_button])
+
+
+    def get_asset_path(self, relative_path):
+        if os.path.exists(resource_path(relative_path)) or asset_pack.resolve(relative_path) is not None:
+            return resource_path(relative_path)
+        return None
 
-    def init_main_menu(self):
-        self.stars = 0
 
-        self.static = AnimationObject(0, 0, 100, self.RESOLUTION)
-        self.static.append_frames(resource_path("assets/static.png"))
-        self.static.append_frames(resource_path("assets/static2.png"))
-        self.static.append_frames(resource_path("assets/static3.png"))
-        self.static.append_frames(resource_path("assets/static4.png"))
-        self.static.append_frames(resource_path("assets/static5.png"))
+    def get_cameras(self):
+        links = {camera['room']: [] for camera in self.CAMERAS}
+        for animatronic in NightSimulation.ANIMATRONICS:
+            for room, nexts in animatronic['path'].items():
+                for next_room in nexts:
+                    if room in links and next_room in links and next_room not in links[room]:
+                        links[room].append(next_room)
+                        links[next_room].append(room)
 
-        self.main_menu_background = Panel(0, 0, 1920, 1080, resource_path("assets/main_menu_background.png"), self.RESOLUTION)
+        cameras = []
+        for camera in self.CAMERAS:
+            room = camera['room']
+            variants = {}
+            for animatronic in NightSimulation.ANIMATRONICS:
+                path = self.get_asset_path(f"assets/cam_{room}_{animatronic['name']}.png")
+                if path is not None:
+                    variants[animatronic['name']] = path
 
-        self.menu_swipe = pygame.mixer.Sound(resource_path('sounds/menu_swipe.wav'))
-        self.menu_swipe.set_volume(self.data_volume['VOLUME'])
+            source = self.get_asset_path(f"assets/cam_{room}.png") or resource_path(self.CAMERA_FALLBACK)
+            cameras.append(dict(camera, source=source, variants=variants, links=links[room]))
+        return cameras
 
-        self.new_game_button = MenuButton(100, 390, 'Arial', 62, 'New Game', self.menu_swipe, (255,255,255), self.RESOLUTION)
-        self.continue_button = MenuButton(100, 511, 'Arial', 62, 'Continue', self.menu_swipe, (255,255,255), self.RESOLUTION)
-        self.options_button = MenuButton(100, 632, 'Arial', 62, 'Options', self.menu_swipe, (255,255,255), self.RESOLUTION)
+
+    def init_main_menu(self):
+        self.load_progress()
+
+        if self.procedural_static:
+            self.static = StaticGenerator(0, 0, 1920, 1080, self.RESOLUTION, 100)
+        else:
+            self.static = AnimationObject(0, 0, 100, self.RESOLUTION, precomputed=True)
+            self.static.append_frames(resource_path("assets/static.png"))
+            self.static.append_frames(resource_path("assets/static2.png"))
+            self.static.append_frames(resource_path("assets/static3.png"))
+            self.static.append_frames(resource_path("assets/static4.png"))
+            self.static.append_frames(resource_path("assets/static5.png"))
+        self.main_menu_background = None
+        self.composite_menu_static()
+
+        self.menu_swipe = resource_path('sounds/menu_swipe.wav')
+        sound_bank.load(self.menu_swipe)
+
+        self.new_game_button = MenuButton(100, 390, 'Arial', 62, 'New Game', self.menu_swipe, (255,255,255), self.RESOLUTION, 32)
+        self.continue_button = MenuButton(100, 511, 'Arial', 62, 'Continue', self.menu_swipe, (255,255,255), self.RESOLUTION, 32)
+        self.options_button = MenuButton(100, 632, 'Arial', 62, 'Options', self.menu_swipe, (255,255,255), self.RESOLUTION, 32)
         
-        self.custom_night_button = MenuButton(100, 753, 'Arial', 62, 'Custom Night', self.menu_swipe, (255,255,255), self.RESOLUTION)
-        self.extras_button = MenuButton(100, 874, 'Arial', 62, 'Extras', self.menu_swipe, (255,255,255), self.RESOLUTION)
+        self.custom_night_button = MenuButton(100, 753, 'Arial', 62, 'Custom Night', self.menu_swipe, (255,255,255), self.RESOLUTION, 32)
+        self.extras_button = MenuButton(100, 874, 'Arial', 62, 'Extras', self.menu_swipe, (255,255,255), self.RESOLUTION, 32)
 
-        self.exit_button = MenuButton(100, 980, 'Arial', 62, 'Exit', self.menu_swipe, (255,255,255), self.RESOLUTION)
+        self.exit_button = MenuButton(100, 980, 'Arial', 62, 'Exit', self.menu_swipe, (255,255,255), self.RESOLUTION, 32)
 
         self.copyright_text = Text(1250, 1040, 'Arial', 32, "© 2023 KosaQDev Inspired By Scott Cawthon.", (255,255,255), self.RESOLUTION)
 
+        self.new_game_button.on_click = self.new_game
+        self.continue_button.on_click = self.continue_game
+        self.options_button.on_click = lambda: self.set_state('Options')
+        self.custom_night_button.on_click = self.start_custom_night
+        self.exit_button.on_click = self.quit
+
+        self.set_menu_widgets()
+
+        self.loaded_states.add('MainMenu')
+
+
+    def set_menu_widgets(self):
+        menu_buttons = [self.new_game_button, self.continue_button, self.options_button]
+        if self.stars == 1:
+            menu_buttons += [self.custom_night_button, self.extras_button]
+        menu_buttons.append(self.exit_button)
+        self.dispatcher.set_widgets('MainMenu', menu_buttons)
+
+
+    def composite_menu_static(self):
+        main_menu_background = asset_manager.acquire(resource_path("assets/main_menu_background.png"), (self.static.scale_x, self.static.scale_y), 'auto')
+
+        if self.procedural_static:
+            self.static.set_background(main_menu_background)
+            if self.main_menu_background is not None:
+                asset_manager.release(self.main_menu_background)
+            self.main_menu_background = main_menu_background
+        else:
+            self.static.composite_over(main_menu_background)
+            asset_manager.release(main_menu_background)
+
 
     def init_options(self):
         self.resolutions = ['1920 x 1080', '1600 x 900', '1366 x 768', '1280 x 720']
         self.fullscreen = True
 
-        self.apply_button = MenuButton(200, 780, 'Arial', 62, 'Apply', self.menu_swipe, (255,255,255), self.RESOLUTION)
-        self.back_button = MenuButton(200, 900, 'Arial', 62, 'Back', self.menu_swipe, (255,255,255), self.RESOLUTION)
+        self.apply_button = MenuButton(200, 780, 'Arial', 62, 'Apply', self.menu_swipe, (255,255,255), self.RESOLUTION, 32)
+        self.back_button = MenuButton(200, 900, 'Arial', 62, 'Back', self.menu_swipe, (255,255,255), self.RESOLUTION, 32)
 
         self.resolution_index = 0
         self.resolution_text = Text(332, 300, 'Arial', 62, self.resolutions[self.resolution_index], (255,255,255), self.RESOLUTION)
         self.resolution_left = MenuButton(200, 300, 'Arial', 62, '<', None, (255,255,255), self.RESOLUTION)
         self.resolution_right = MenuButton(264, 300, 'Arial', 62, '>', None, (255,255,255), self.RESOLUTION)
 
-        self.fullscreen_checkbox = Checkbox(220, 200, 64, 64, 'Arial', 62, self.RESOLUTION, checked_offset_x=10, checked_offset_y=-3)
+        self.fullscreen_checkbox = Checkbox(220, 200, 64, 64, 'Arial', 62, self.RESOLUTION, checked_offset_x=10, checked_offset_y=-3,
+                                            source=resource_path("assets/blank.png"), checked_source=resource_path("assets/blank_x.png"))
         self.fullscreen_text = Text(332, 200, 'Arial', 62, "Fullscreen", (255,255,255), self.RESOLUTION)
 
         self.volume_left = MenuButton(200, 400, 'Arial', 62, '<', None, (255,255,255), self.RESOLUTION)
@@ -157,134 +509,294 @@ class Game:
             self.resolution_index = 3
 
         self.resolution_text.change_text(self.resolutions[self.resolution_index])
+        self.fullscreen = self.fullscreen_checkbox.state
+
+        self.back_button.on_click = lambda: self.set_state('MainMenu')
+        self.apply_button.on_click = self.apply_options
+        self.resolution_left.on_click = lambda: self.change_resolution(-1)
+        self.resolution_right.on_click = lambda: self.change_resolution(1)
+        self.volume_left.on_click = lambda: self.change_volume(-5)
+        self.volume_right.on_click = lambda: self.change_volume(5)
+        self.fullscreen_checkbox.on_change = self.set_fullscreen
+
+        self.dispatcher.set_widgets('Options', [self.apply_button, self.back_button, self.resolution_left, self.resolution_right,
+                                                self.fullscreen_checkbox, self.volume_left, self.volume_right])
+
+        self.loaded_states.add('Options')
+
+
+    def set_state(self, state):
+        self.state = state
+
+
+    def new_game(self):
+        self.night = 1
+        self.save_progress()
+        self.continue_game()
+
+
+    def continue_game(self):
+        self.custom_night = False
+        self.set_state('Game')
+
+
+    def start_custom_night(self):
+        self.custom_night = True
+        self.set_state('Game')
+
+
+    def get_night_levels(self):
+        if self.custom_night:
+            return self.custom_night_levels
+        return NightSimulation.NIGHT_PRESETS[min(self.night, max(NightSimulation.NIGHT_PRESETS))]
+
+
+    def start_night(self):
+        self.night_started = True
+        self.night_sim = None
+        if NightSimulation.is_available():
+            self.night_sim = NightSimulation(self.get_night_levels(), self.tick_rate)
+
+        self.in_cameras = False
+        self.cam_button.value = 0
+        self.cameras.reset()
+
+        self.night_text.change_text("Custom Night" if self.custom_night else f"Night {self.night}")
+        self.hour_text.change_text(self.HOURS[0])
+        self.power_text.change_text("Power: 100%")
+
+
+    def end_night(self):
+        if self.night_sim.get_survived()[0] and not self.custom_night:
+            self.night += 1
+            if self.night > max(NightSimulation.NIGHT_PRESETS):
+                self.night = max(NightSimulation.NIGHT_PRESETS)
+                self.stars = 1
+                self.set_menu_widgets()
+            self.save_progress()
+
+        self.night_sim = None
+        self.night_started = False
+        self.set_state('MainMenu')
+
+
+    def quit(self):
+        self.done = True
+
+
+    def apply_options(self):
+        if self.pending_resolution is None:
+            self.apply_settings()
+
+
+    def change_resolution(self, step):
+        if 0 <= self.resolution_index + step < len(self.resolutions):
+            self.resolution_index += step
+            self.resolution_text.change_text(self.resolutions[self.resolution_index])
+
+
+    def change_volume(self, step):
+        if (step < 0 and self.volume > 0) or (step > 0 and self.volume < 100):
+            self.volume += step
+            self.volume_text.change_text(f"Volume: {int(self.volume)}%")
+
+
+    def set_fullscreen(self, value):
+        self.fullscreen = value
+
+
+    def load_state(self, state):
+        if state in self.loaded_states:
+            return True
+
+        if state == 'Options':
+            self.init_options()
+        elif state == 'Game':
+            self.loader.prefetch('Game')
+            if not self.loader.is_ready('Game'):
+                return False
+            self.init_office()
+
+        return True
+
+
+    def draw_loading_screen(self):
+        self.screen.fill((0,0,0))
+        self.loading_text.change_text(f"Loading... {int(self.loader.get_progress(self.state) * 100)}%")
+        self.loading_text.draw_text(self.screen)
+
+
+    def get_widgets(self):
+        widgets = [self.loading_text, self.new_game_button, self.continue_button, self.options_button,
+                   self.custom_night_button, self.extras_button, self.exit_button, self.copyright_text]
+
+        if 'Options' in self.loaded_states:
+            widgets += [self.apply_button, self.back_button, self.resolution_text, self.resolution_left, self.resolution_right,
+                        self.fullscreen_checkbox, self.fullscreen_text, self.volume_left, self.volume_right, self.volume_text]
+
+        if 'Game' in self.loaded_states:
+            widgets += [self.cam_button, self.office, self.office_door_button, self.office_front_vent_button,
+                        self.office_right_vent_button, self.cameras, self.cam_anim, self.hour_text, self.night_text, self.power_text]
+            if self.cam_static is not None:
+                widgets.append(self.cam_static)
+            if self.panorama is not None:
+                widgets.append(self.panorama)
+
+        return widgets
+
+
+    def apply_settings(self):
+        old_fullscreen = self.data_fullscreen['FULLSCREEN']
+        old_volume = self.data_volume['VOLUME']
+
+        self.save_data()
+
+        resolution = (self.data_resolution['WIDTH'], self.data_resolution['HEIGHT'])
+
+        if self.data_volume['VOLUME'] != old_volume:
+            sound_bank.set_volume(self.data_volume['VOLUME'])
+
+        if self.logical_display:
+            if self.data_fullscreen['FULLSCREEN'] != old_fullscreen:
+                self.set_logical_fullscreen()
+            if resolution != self.window_resolution:
+                self.window_resolution = resolution
+                if self.data_fullscreen['FULLSCREEN'] == 0:
+                    self.resize_window(resolution)
+        elif resolution != self.RESOLUTION:
+            self.begin_resolution_change(resolution)
+        elif self.data_fullscreen['FULLSCREEN'] != old_fullscreen:
+            self.init_display()
+
+
+    def begin_resolution_change(self, resolution):
+        assets = self.MENU_ASSETS
+        if not self.procedural_static:
+            assets = assets + self.STATIC_ASSETS
+        if 'Game' in self.loaded_states:
+            assets = assets + self.GAME_ASSETS
+
+        self.pending_resolution = resolution
+        self.loader.register('Resolution', self.get_manifest(assets), self.get_scale(resolution))
+        self.loader.prefetch('Resolution')
+
+
+    def finish_resolution_change(self):
+        ratio = float(self.pending_resolution[0]) / float(self.RESOLUTION[0])
+
+        self.window_resolution = self.pending_resolution
+        self.pending_resolution = None
+        self.init_display()
+
+        self.offset_x = self.get_scale()[0]
+        self.office_x *= ratio
+        self.previous_office_x *= ratio
+
+        for widget in self.get_widgets():
+            widget.set_resolution(self.RESOLUTION)
+
+        self.static.set_resolution(self.RESOLUTION)
+        self.composite_menu_static()
+
+        self.dispatcher.rebuild()
+
+        self.loader.discard('Resolution')
+        if 'Game' not in self.loaded_states:
+            self.loader.register('Game', self.get_manifest(self.GAME_ASSETS), self.get_scale())
+        asset_manager.clear_prefetched()
 
 
     def handle_main_menu(self, mx, my):
-        if self.new_game_button.get_clicked(mx, my, 0):
-            self.state = 'Game'
+        if self.stars == 1:
+            self.renderer.collect(self.custom_night_button, self.extras_button)
 
-        if self.options_button.get_clicked(mx, my, 0):
-            self.state = 'Options'
-        
-        if self.exit_button.get_clicked(mx, my, 0):
-            self.done = True
+        self.static.update_loop()
+
+        if self.new_game_button.hovered:
+            self.loader.prefetch('Game')
+
+        self.renderer.collect(self.new_game_button, self.continue_button, self.options_button, self.exit_button, self.copyright_text, self.static)
+        if not self.renderer.has_dirty():
+            return None
 
-        self.main_menu_background.draw(self.screen)
+        self.renderer.begin()
+        self.static.draw(self.screen)
 
-        self.new_game_button.draw(self.screen, mx, my, 32)
-        self.continue_button.draw(self.screen, mx, my, 32)
-        self.options_button.draw(self.screen, mx, my, 32)
+        self.new_game_button.draw(self.screen)
+        self.continue_button.draw(self.screen)
+        self.options_button.draw(self.screen)
 
 
         if self.stars == 1:
-            self.custom_night_button.draw(self.screen, mx, my, 32)
-            self.extras_button.draw(self.screen, mx, my, 32)
+            self.custom_night_button.draw(self.screen)
+            self.extras_button.draw(self.screen)
 
-        self.exit_button.draw(self.screen, mx, my, 32)
+        self.exit_button.draw(self.screen)
         self.copyright_text.draw_text(self.screen)
-        self.static.play_loop(self.screen)
 
 
     def save_data(self):
-        with open(resource_path("config.json"), "w") as f:
-                if self.fullscreen:
-                    self.data['options'][1]['FULLSCREEN'] = 1
-                else:
-                    self.data['options'][1]['FULLSCREEN'] = 0
-
-                if self.resolution_index == 0:
-                    self.data['options'][0]['WIDTH'] = 1920
-                    self.data['options'][0]['HEIGHT'] = 1080
-                elif self.resolution_index == 1:
-                    self.data['options'][0]['WIDTH'] = 1600
-                    self.data['options'][0]['HEIGHT'] = 900
-                elif self.resolution_index == 2:
-                    self.data['options'][0]['WIDTH'] = 1366
-                    self.data['options'][0]['HEIGHT'] = 768
-                elif self.resolution_index == 3:
-                    self.data['options'][0]['WIDTH'] = 1280
-                    self.data['options'][0]['HEIGHT'] = 720
-
-                self.data['options'][2]['VOLUME'] = float(self.volume * 0.01)
-
-                json.dump(self.data, f)
+        if self.fullscreen:
+            self.data['options'][1]['FULLSCREEN'] = 1
+        else:
+            self.data['options'][1]['FULLSCREEN'] = 0
+
+        if self.resolution_index == 0:
+            self.data['options'][0]['WIDTH'] = 1920
+            self.data['options'][0]['HEIGHT'] = 1080
+        elif self.resolution_index == 1:
+            self.data['options'][0]['WIDTH'] = 1600
+            self.data['options'][0]['HEIGHT'] = 900
+        elif self.resolution_index == 2:
+            self.data['options'][0]['WIDTH'] = 1366
+            self.data['options'][0]['HEIGHT'] = 768
+        elif self.resolution_index == 3:
+            self.data['options'][0]['WIDTH'] = 1280
+            self.data['options'][0]['HEIGHT'] = 720
+
+        self.data['options'][2]['VOLUME'] = float(self.volume * 0.01)
+
+        self.saves.save(self.get_config_path(), self.data)
     
 
     def handle_options(self, mx, my):
-        if self.back_button.get_clicked(mx, my, 0):
-            self.state = 'MainMenu'
-
-        if self.apply_button.get_clicked(mx, my, 0):
-            self.save_data()
-            self.init_game()
-            self.init_main_menu()
-            self.init_options()
+        self.static.update_loop()
 
+        self.renderer.collect(self.back_button, self.apply_button, self.fullscreen_checkbox, self.fullscreen_text,
+                              self.resolution_left, self.resolution_right, self.resolution_text,
+                              self.volume_left, self.volume_right, self.volume_text, self.static)
+        if not self.renderer.has_dirty():
+            return None
 
-        if self.resolution_left.get_clicked(mx, my, 0) and self.resolution_index > 0:
-            self.resolution_index -= 1
-            self.resolution_text.change_text(self.resolutions[self.resolution_index])
-        if self.resolution_right.get_clicked(mx, my, 0) and self.resolution_index < (len(self.resolutions) -1):
-            self.resolution_index += 1
-            self.resolution_text.change_text(self.resolutions[self.resolution_index])
-
-        if self.volume_left.get_clicked(mx, my, 0) and self.volume > 0:
-            self.volume -= 5
-            self.volume_text.change_text(f"Volume: {int(self.volume)}%")
-        if self.volume_right.get_clicked(mx, my, 0) and self.volume < 100:
-            self.volume += 5
-            self.volume_text.change_text(f"Volume: {int(self.volume)}%")
-
-        self.main_menu_background.draw(self.screen)
-        self.fullscreen = self.fullscreen_checkbox.get_check_state(mx, my, 0)
-        self.back_button.draw(self.screen, mx, my, 32)
-        self.apply_button.draw(self.screen, mx, my, 32)
+        self.renderer.begin()
+        self.static.draw(self.screen)
+        self.back_button.draw(self.screen)
+        self.apply_button.draw(self.screen)
 
         self.fullscreen_checkbox.draw(self.screen)
         self.fullscreen_text.draw_text(self.screen)
 
-        self.resolution_left.draw(self.screen, mx, my)
-        self.resolution_right.draw(self.screen, mx, my)
+        self.resolution_left.draw(self.screen)
+        self.resolution_right.draw(self.screen)
         self.resolution_text.draw_text(self.screen)
 
-        self.volume_left.draw(self.screen, mx, my)
-        self.volume_right.draw(self.screen, mx, my)
+        self.volume_left.draw(self.screen)
+        self.volume_right.draw(self.screen)
         self.volume_text.draw_text(self.screen)
 
-        self.static.play_loop(self.screen)
 
+    def has_power(self):
+        return self.night_sim is None or self.night_sim.get_power()[0] > 0
 
-    def handle_office_invisible_buttons(self, mx, my):
-        self.office_door_button.update(mx, my)
-        self.office_front_vent_button.update(mx, my)
-        self.office_right_vent_button.update(mx, my)
 
-        
-        if self.office_door_button.get_clicked() and not self.in_cameras:
-            self.office_door.set_visible(True)
-            self.office.set_visible(False)
-        else:
-            self.office_door.set_visible(False)
-            self.office.set_visible(True)
-
-        if self.office_front_vent_button.get_clicked() and not self.in_cameras:
-            self.office_front_vent.set_visible(True)
-            self.office.set_visible(False)
-        else:
-            self.office_front_vent.set_visible(False)
-            self.office.set_visible(True)
-
-        if self.office_right_vent_button.get_clicked() and not self.in_cameras:
-            self.office_right_vent.set_visible(True)
-            self.office.set_visible(False)
-        else:
-            self.office_right_vent.set_visible(False)
-            self.office.set_visible(True)
+    def handle_office_invisible_buttons(self):
+        powered = self.has_power()
+        self.office.set_variant('door', self.office_door_button.get_clicked() and not self.in_cameras and powered)
+        self.office.set_variant('front_vent', self.office_front_vent_button.get_clicked() and not self.in_cameras and powered)
+        self.office.set_variant('right_vent', self.office_right_vent_button.get_clicked() and not self.in_cameras and powered)
 
     
     def handle_cameras(self):
-        self.cam_button.update()
-
         if self.in_cameras == 0 and self.cam_button.value == 1:
             self.cam_button.value = 0
             self.in_cameras = 1
@@ -292,68 +804,221 @@ class Game:
             self.cam_button.value = 0
             self.in_cameras = 0
 
+        if not self.has_power():
+            self.in_cameras = 0
+
         if self.in_cameras == 1:
-            self.cam1.set_visible(True)
-            self.office.set_visible(False)
+            self.cameras.open()
         elif self.in_cameras == 0:
-            self.cam1.set_visible(False)
-            self.office.set_visible(True)
+            self.cameras.close()
+
+        self.cameras.update()
+        self.office.set_visible(not self.cameras.is_up())
+        if self.cameras.is_up() != self.camera_widgets_up:
+            self.set_game_widgets()
 
 
     def handle_office_scrolling(self, mx, my):
-        if mx < (400 * self.offset_x) and self.office.x < 0 and not self.in_cameras:
-                self.office.x += self.speed_x
-                self.office_door_button.x += self.speed_x
-                self.office_front_vent_button.x += self.speed_x
-                self.office_right_vent_button.x += self.speed_x
+        self.previous_office_x = self.office_x
 
-        elif mx > (1620 * self.offset_x) and self.office.x > (-570 * self.offset_x) and not self.in_cameras:
-            self.office.x -= self.speed_x
-            self.office_door_button.x -= self.speed_x
-            self.office_front_vent_button.x -= self.speed_x
-            self.office_right_vent_button.x -= self.speed_x
+        if mx < (400 * self.offset_x) and self.office_x < 0 and not self.in_cameras:
+                self.office_x += self.speed_x
 
-        self.office_door.x = self.office.x
-        self.office_front_vent.x = self.office.x
-        self.office_right_vent.x = self.office.x
+        elif mx > (1620 * self.offset_x) and self.office_x > (-570 * self.offset_x) and not self.in_cameras:
+            self.office_x -= self.speed_x
 
 
-    def update(self) -> None:
-        while not self.done:
-            self.clock.tick(self.fps)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.done = True
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                       self.done = True
-            
-            mx, my = pygame.mouse.get_pos()
+    def interpolate_office(self, alpha):
+        x = round(self.previous_office_x + (self.office_x - self.previous_office_x) * alpha)
 
-            if self.state == 'MainMenu':
-                self.handle_main_menu(mx, my)
-            
-            elif self.state == 'Options':
-                self.handle_options(mx, my)
+        self.office.x = x
 
-            elif self.state == 'Game':
-                self.handle_office_scrolling(mx, my)
 
-                self.handle_office_invisible_buttons(mx, my)
+    def update_night(self, ticks):
+        if self.night_sim is None:
+            return None
 
-                self.handle_cameras()
+        self.night_sim.set_controls([name in self.office.active for name in NightSimulation.DEFENSES],
+                                    self.cameras.get_room() if self.cameras.is_up() else -1)
+        self.night_sim.tick(ticks)
+        self.cameras.set_occupants(self.night_sim.get_rooms())
 
-                self.office.draw(self.screen)
-                self.office_door.draw(self.screen)
-                self.office_front_vent.draw(self.screen)
-                self.office_right_vent.draw(self.screen)
+        self.hour_text.change_text(self.HOURS[self.night_sim.get_hour()])
+        self.power_text.change_text(f"Power: {int(self.night_sim.get_power()[0])}%")
 
-                self.cam1.draw(self.screen)
+        if self.night_sim.is_finished():
+            self.end_night()
 
-                self.cam_button.draw(self.screen)
 
-            pygame.display.update()
+    def handle_game(self, mx, my, ticks = 1):
+        if not self.night_started:
+            self.start_night()
+
+        for _ in range(ticks):
+            self.handle_office_scrolling(mx, my)
+
+        self.interpolate_office(self.clock.get_alpha())
+        self.dispatcher.set_scroll(self.office.x)
+
+        self.handle_office_invisible_buttons()
+
+        self.handle_cameras()
+
+        self.update_night(ticks)
+        if self.state != 'Game':
+            return None
+
+        static_frame = None
+        if self.cam_static is not None:
+            if self.cameras.is_up():
+                self.cam_static.update_loop()
+                static_frame = self.cam_static.frame
+            else:
+                self.cam_static.pause()
+
+        office_view = (self.office.x, self.office.visible, frozenset(self.office.active), self.cameras.get_view_key(), self.cam_button.state, static_frame,
+                       self.hour_text.text, self.power_text.text, self.panorama is None or self.panorama.is_settled())
+        if office_view != self.last_office_view:
+            self.last_office_view = office_view
+            self.renderer.mark_all()
+
+        if not self.renderer.has_dirty():
+            return None
+
+        self.renderer.begin()
+        self.draw_office()
+
+
+    def draw_office(self):
+        if self.panorama is not None:
+            self.panorama.draw(self.screen, self.office, (self.office.x, frozenset(self.office.active)))
+        else:
+            self.office.draw(self.screen)
+
+        self.cameras.draw_feed(self.screen)
+        if self.cam_static is not None and self.cameras.is_up():
+            self.cam_static.draw(self.screen)
+        self.cameras.draw_flip(self.screen)
+        self.cameras.draw_map(self.screen)
+
+        self.cam_button.draw(self.screen)
+
+        self.hour_text.draw_text(self.screen)
+        self.night_text.draw_text(self.screen)
+        self.power_text.draw_text(self.screen)
+
+
+    def toggle_profiler(self):
+        if self.profiler is None:
+            self.profiler = Profiler()
+            self.profiler.wrap(self, 'step', 'frame')
+            self.profiler.wrap(self, 'poll_input', 'input')
+            self.profiler.wrap(self, 'handle_main_menu', 'main_menu')
+            self.profiler.wrap(self, 'handle_options', 'options')
+            self.profiler.wrap(self, 'handle_office_scrolling', 'office_scrolling')
+            self.profiler.wrap(self, 'handle_office_invisible_buttons', 'office_buttons')
+            self.profiler.wrap(self, 'handle_cameras', 'cameras')
+            self.profiler.wrap(self, 'update_night', 'night_sim')
+            self.profiler.wrap(self, 'draw_office', 'office_blits')
+            self.profiler.wrap(self.renderer, 'present', 'display_update')
+        else:
+            self.profiler.unwrap_all()
+            self.profiler = None
+        self.renderer.mark_all()
+
+
+    def dump_profiler_trace(self):
+        if self.profiler is not None:
+            path = data_path(f"trace_{int(time.time())}.json")
+            self.profiler.dump_trace(path)
+            print(f"Wrote frame trace to '{path}'")
+
+
+    def get_wait_time(self):
+        if not self.clock.is_idle() or self.profiler is not None or self.pending_resolution is not None:
+            return 0
+        if self.state not in self.loaded_states:
+            return 0
+
+        if self.state in ('MainMenu', 'Options'):
+            return min(self.static.get_time_to_next_frame(), self.max_wait_ms)
+        if self.cameras.is_up() and self.cam_static is not None:
+            return min(self.cam_static.get_time_to_next_frame(), self.cameras.get_wait_time(self.max_wait_ms))
+        return self.cameras.get_wait_time(self.max_wait_ms)
+
+
+    def poll_input(self):
+        for event in self.dispatcher.poll(self.get_wait_time()):
+            if event.type == pygame.QUIT:
+                self.done = True
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                   self.done = True
+                elif event.key == pygame.K_F3:
+                    self.toggle_profiler()
+                elif event.key == pygame.K_F4:
+                    self.dump_profiler_trace()
+
+        return self.dispatcher.mouse_pos
+
+
+    def step(self, dt = None) -> None:
+        if dt is None:
+            dt = self.clock.tick_ms
+
+        mx, my = self.poll_input()
+
+        if self.pending_resolution is not None and self.loader.is_ready('Resolution'):
+            self.finish_resolution_change()
+
+        if self.state != self.last_state:
+            self.last_state = self.state
+            self.last_office_view = None
+            self.night_sim = None
+            self.night_started = False
+            self.dispatcher.set_state(self.state)
+            if self.procedural_static and self.state not in ('MainMenu', 'Options'):
+                self.static.pause()
+            self.clock.reset()
+            self.renderer.mark_all()
+
+        if not self.load_state(self.state):
+            self.renderer.mark_all()
+            self.draw_loading_screen()
+
+        elif self.state == 'MainMenu':
+            self.handle_main_menu(mx, my)
+        
+        elif self.state == 'Options':
+            self.handle_options(mx, my)
+
+        elif self.state == 'Game':
+            self.handle_game(mx, my, self.clock.advance(dt))
+
+        active = (mx, my) != self.last_mouse or self.dispatcher.buttons[0] or self.office_x != self.previous_office_x
+        self.last_mouse = (mx, my)
+        self.clock.set_idle(not active)
+
+        if self.profiler is not None:
+            self.renderer.mark_dirty(self.profiler.draw_overlay(self.screen, self.clock.get_fps()))
+
+        self.renderer.present()
+
+
+    def update(self) -> None:
+        self.step(self.clock.tick())
+        self.finish_startup()
+
+        while not self.done:
+            self.step(self.clock.tick())
+
+        self.loader.shutdown()
+        if 'Game' in self.loaded_states:
+            self.cameras.release()
+        if not self.saves.flush():
+            print("Something went wrong while waiting for pending saves")
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     Game()
\ No newline at end of file
@@ -1,35 +1,153 @@
 import pygame
+from modules.AssetManager import asset_manager
 
 class AnimationObject:
-    def __init__(self, x : int, y : int, frame_delay : int, resolution = (1920, 1080)) -> None:
+    def __init__(self, x : int, y : int, frame_delay : int, resolution = (1920, 1080), precomputed : bool = False) -> None:
         self.scale_x = float(float(resolution[0]) / 1920.0)
         self.scale_y = float(float(resolution[1]) / 1080.0)
         
         self.x = x * self.scale_x
         self.y = y * self.scale_y
         self.frame_delay = frame_delay
+        self.precomputed = precomputed
 
         self.frames = []
+        self.offsets = []
+        self.sources = []
         self.frame = 0
         self.last_tick = pygame.time.get_ticks()
 
+        self.pinned = False
+        self.shown = None
+        self.dirty = True
+
     def append_frames(self, resource_path : str):
-        self.frames.append(pygame.transform.scale_by(pygame.image.load(resource_path).convert_alpha(), (self.scale_x, self.scale_y)))
+        frame, offset = asset_manager.acquire_trimmed_handle(resource_path, (self.scale_x, self.scale_y), 'auto' if self.precomputed else True)
+        if self.pinned:
+            asset_manager.store.pin(frame)
+        self.frames.append(frame)
+        self.offsets.append(offset)
+        self.sources.append(resource_path)
 
-    def play_reverse(self, screen):
+    def set_resolution(self, resolution):
+        scale_x = float(float(resolution[0]) / 1920.0)
+        scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.x = self.x / self.scale_x * scale_x
+        self.y = self.y / self.scale_y * scale_y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+
+        frames = [asset_manager.acquire_trimmed_handle(source, (self.scale_x, self.scale_y), 'auto' if self.precomputed else True) for source in self.sources]
+        self.release()
+        self.frames = [frame for frame, _ in frames]
+        self.offsets = [offset for _, offset in frames]
+        self.pin_frames()
+        self.dirty = True
+
+    def composite_over(self, background : pygame.Surface):
+        composited = []
+        for frame, (offset_x, offset_y) in zip(self.frames, self.offsets):
+            surface = background.copy()
+            surface.blit(asset_manager.get_surface(frame), (self.x + offset_x, self.y + offset_y))
+            composited.append(asset_manager.store.put(surface.convert()))
+            if self.pinned:
+                asset_manager.store.unpin(frame)
+            asset_manager.release_handle(frame)
+
+        self.frames = composited
+        self.pin_frames()
+        self.offsets = [(0, 0)] * len(composited)
+        self.x = 0
+        self.y = 0
+        self.dirty = True
+
+    def pin_frames(self):
+        if self.pinned:
+            for frame in self.frames:
+                asset_manager.store.pin(frame)
+
+    def pin(self):
+        if not self.pinned:
+            self.pinned = True
+            self.pin_frames()
+
+    def unpin(self):
+        if self.pinned:
+            for frame in self.frames:
+                asset_manager.store.unpin(frame)
+            self.pinned = False
+        self.shown = None
+
+    def release(self):
+        for frame in self.frames:
+            if self.pinned:
+                asset_manager.store.unpin(frame)
+            asset_manager.release_handle(frame)
+        self.frames = []
+        self.offsets = []
+        self.frame = 0
+        self.shown = None
+
+    def get_dirty_rects(self):
+        offset_x, offset_y = self.offsets[self.frame]
+        return [pygame.Rect((self.x + offset_x, self.y + offset_y), asset_manager.store.get_size(self.frames[self.frame]))]
+
+    def get_elapsed_frames(self):
         self.current_tick = pygame.time.get_ticks()
-        if self.current_tick - self.last_tick > self.frame_delay:
-            if self.frame > 0:
-                self.frame -= 1
-            self.last_tick = pygame.time.get_ticks()
-        screen.blit(self.frames[self.frame], (self.x, self.y))
+        if self.current_tick - self.last_tick <= self.frame_delay:
+            return 0
+
+        elapsed = (self.current_tick - self.last_tick) // self.frame_delay
+        self.last_tick += elapsed * self.frame_delay
+        return elapsed
+
+    def get_time_to_next_frame(self):
+        return max(0, self.last_tick + self.frame_delay + 1 - pygame.time.get_ticks())
+
+    def restart(self, frame = 0):
+        self.frame = frame
+        self.last_tick = pygame.time.get_ticks()
+        self.dirty = True
+
+    def update_once(self):
+        elapsed = self.get_elapsed_frames()
+        if elapsed and self.frame < len(self.frames) - 1:
+            self.frame = min(len(self.frames) - 1, self.frame + elapsed)
+            self.dirty = True
+
+    def update_reverse(self):
+        elapsed = self.get_elapsed_frames()
+        if elapsed and self.frame > 0:
+            self.frame = max(0, self.frame - elapsed)
+            self.dirty = True
+
+    def update_loop(self):
+        elapsed = self.get_elapsed_frames()
+        if elapsed:
+            self.frame = (self.frame + elapsed) % len(self.frames)
+            self.dirty = True
+
+    def draw(self, screen):
+        offset_x, offset_y = self.offsets[self.frame]
+        screen.blit(asset_manager.get_surface(self.frames[self.frame]), (self.x + offset_x, self.y + offset_y))
+
+    def draw_ready(self, screen):
+        surface = asset_manager.store.get_ready(self.frames[self.frame])
+        if surface is not None:
+            self.shown = self.frame
+        elif self.shown is not None:
+            surface = asset_manager.get_surface(self.frames[self.shown])
+        else:
+            return None
+
+        offset_x, offset_y = self.offsets[self.shown]
+        screen.blit(surface, (self.x + offset_x, self.y + offset_y))
+
+    def play_reverse(self, screen):
+        self.update_reverse()
+        self.draw(screen)
 
     def play_loop(self, screen):
-        self.current_tick = pygame.time.get_ticks()
-        if self.current_tick - self.last_tick > self.frame_delay:
-            if (self.frame + 1) > (len(self.frames) - 1):
-                self.frame = 0
-            else:
-                self.frame += 1
-            self.last_tick = pygame.time.get_ticks()
-        screen.blit(self.frames[self.frame], (self.x, self.y))
\ No newline at end of file
+        self.update_loop()
+        self.draw(screen)
\ No newline at end of file
@@ -0,0 +1,158 @@
+import pygame
+import os
+import hashlib
+import struct
+import threading
+
+class AssetCache:
+    MAGIC = b'FN7C'
+    HEADER = struct.Struct('<4sII8s')
+
+    def __init__(self, directory : str = None, enabled : bool = True, max_bytes : int = 256 * 1048576) -> None:
+        self.directory = directory
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+
+        self.pack = None
+
+        self.hits = 0
+        self.misses = 0
+
+
+    def set_directory(self, directory : str) -> None:
+        self.directory = directory
+
+
+    def set_pack(self, pack) -> None:
+        self.pack = pack
+
+
+    def is_packed(self, source : str) -> bool:
+        return self.pack is not None and self.pack.resolve(source) is not None
+
+
+    def get_cache_path(self, source : str, scale : tuple, alpha : bool) -> str:
+        if self.is_packed(source):
+            stamp = f"{self.pack.resolve(source)}|{self.pack.stamp}"
+        else:
+            stat = os.stat(source)
+            stamp = f"{os.path.abspath(source)}|{stat.st_mtime_ns}|{stat.st_size}"
+        key = f"{stamp}|{scale[0]!r}x{scale[1]!r}|{alpha}"
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.raw')
+
+
+    def read(self, cache_path : str) -> pygame.Surface:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+
+        magic, width, height, pixel_format = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC:
+            return None
+
+        pixel_format = pixel_format.rstrip(b'\0').decode()
+        pixels = memoryview(data)[self.HEADER.size:]
+        if len(pixels) != width * height * len(pixel_format):
+            return None
+
+        return pygame.image.frombuffer(pixels, (width, height), pixel_format)
+
+
+    def write(self, cache_path : str, surface : pygame.Surface, alpha : bool) -> None:
+        pixel_format = 'RGBA' if alpha else 'RGB'
+        header = self.HEADER.pack(self.MAGIC, surface.get_width(), surface.get_height(), pixel_format.encode())
+
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f'{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(pygame.image.tobytes(surface, pixel_format))
+        os.replace(temp_path, cache_path)
+
+
+    def load_scaled(self, source : str, scale : tuple) -> pygame.Surface:
+        image = self.pack.load(source) if self.is_packed(source) else pygame.image.load(source)
+        if scale != (1.0, 1.0):
+            image = pygame.transform.scale_by(image, scale)
+        return image
+
+
+    def load_raw(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> pygame.Surface:
+        # Does not touch the display, so it is safe to call from a loader thread.
+        if not self.enabled or self.directory is None or (scale == (1.0, 1.0) and self.is_packed(source)):
+            return self.load_scaled(source, scale)
+
+        cache_path = self.get_cache_path(source, scale, alpha)
+
+        image = None
+        if os.path.exists(cache_path):
+            try:
+                image = self.read(cache_path)
+            except (OSError, ValueError, struct.error):
+                image = None
+
+        if image is not None:
+            self.hits += 1
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return image
+
+        self.misses += 1
+        image = self.load_scaled(source, scale)
+
+        try:
+            self.write(cache_path, image, alpha)
+        except OSError as e:
+            print(f"Could not write asset cache for '{source}': {e}")
+
+        return image
+
+
+    def load(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> pygame.Surface:
+        image = self.load_raw(source, scale, alpha)
+        return image.convert_alpha() if alpha else image.convert()
+
+
+    def clear(self) -> None:
+        if self.directory is None or not os.path.isdir(self.directory):
+            return None
+
+        for name in os.listdir(self.directory):
+            if name.endswith('.raw') or name.endswith('.tmp'):
+                os.remove(os.path.join(self.directory, name))
+
+
+    def prune(self, max_bytes : int = None) -> int:
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if self.directory is None or not os.path.isdir(self.directory):
+            return 0
+
+        files = []
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith('.tmp'):
+                    os.remove(path)
+                    removed += 1
+                elif name.endswith('.raw'):
+                    stat = os.stat(path)
+                    files.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+asset_cache = AssetCache()
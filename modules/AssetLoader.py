@@ -0,0 +1,142 @@
+import os
+import time
+import pygame
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from modules.AssetCache import asset_cache
+from modules.AssetManager import asset_manager
+from modules.AssetPack import asset_pack
+
+def decode_asset(source : str, scale : tuple, alpha, directory : str = None, pack_path : str = None):
+    if directory is not None:
+        asset_cache.set_directory(directory)
+    if pack_path is not None and asset_pack.path != pack_path and asset_pack.open(pack_path):
+        asset_cache.set_pack(asset_pack)
+
+    image = asset_cache.load_raw(source, scale, alpha)
+    pixel_format = 'RGBA' if alpha else 'RGB'
+    return image.get_size(), pixel_format, pygame.image.tobytes(image, pixel_format)
+
+
+class AssetLoader:
+    def __init__(self, manager = asset_manager, workers : int = None, mode : str = 'thread') -> None:
+        self.manager = manager
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.mode = mode
+        self.pool = None
+
+        self.manifests = {}
+        self.threads = {}
+        self.progress = {}
+
+
+    def register(self, state : str, assets : list, scale : tuple = (1.0, 1.0)) -> None:
+        self.discard(state)
+        self.manifests[state] = [(source, scale, alpha) for source, alpha in assets]
+        self.progress[state] = 0
+
+
+    def discard(self, state : str) -> None:
+        thread = self.threads.pop(state, None)
+        if thread is not None:
+            thread.join()
+
+        self.manifests.pop(state, None)
+        self.progress.pop(state, None)
+
+
+    def prefetch(self, state : str) -> None:
+        if state not in self.manifests or state in self.threads:
+            return None
+
+        thread = threading.Thread(target=self.load_manifest, args=(state,), daemon=True)
+        self.threads[state] = thread
+        thread.start()
+
+
+    def get_pool(self):
+        if self.pool is None and self.workers > 1:
+            try:
+                if self.mode == 'process':
+                    self.pool = ProcessPoolExecutor(self.workers)
+                else:
+                    self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix='AssetLoader')
+            except Exception as e:
+                print(f"Something went wrong while starting the asset loader pool, loading serially: {e}")
+                self.workers = 1
+        return self.pool
+
+
+    def load_manifest(self, state : str) -> None:
+        pool = self.get_pool()
+        if pool is None:
+            self.load_serial(state)
+            return None
+
+        as_bytes = self.mode == 'process'
+
+        futures = {}
+        for source, scale, alpha in self.manifests[state]:
+            if not self.manager.needs_prefetch(source, scale, alpha):
+                self.progress[state] += 1
+                continue
+
+            key_scale = self.manager.get_key(source, scale, alpha)[1]
+            if as_bytes:
+                pack_path = self.manager.cache.pack.path if self.manager.cache.pack is not None else None
+                future = pool.submit(decode_asset, source, key_scale, alpha, self.manager.cache.directory, pack_path)
+            else:
+                future = pool.submit(self.manager.cache.load_raw, source, key_scale, alpha)
+            futures[future] = (source, scale, alpha, time.perf_counter())
+
+        for future in as_completed(futures):
+            source, scale, alpha, start = futures[future]
+            try:
+                raw = future.result()
+                if as_bytes:
+                    size, pixel_format, data = raw
+                    raw = pygame.image.frombuffer(data, size, pixel_format)
+                self.manager.store_prefetched(source, scale, alpha, raw, time.perf_counter() - start)
+            except Exception as e:
+                print(f"Something went wrong while prefetching '{source}': {e}")
+            self.progress[state] += 1
+
+
+    def load_serial(self, state : str) -> None:
+        for source, scale, alpha in self.manifests[state]:
+            try:
+                self.manager.prefetch(source, scale, alpha)
+            except Exception as e:
+                print(f"Something went wrong while prefetching '{source}': {e}")
+            self.progress[state] += 1
+
+
+    def is_ready(self, state : str) -> bool:
+        if state not in self.manifests:
+            return True
+
+        thread = self.threads.get(state)
+        return thread is not None and not thread.is_alive()
+
+
+    def get_progress(self, state : str) -> float:
+        if not self.manifests.get(state):
+            return 1.0
+        return self.progress[state] / len(self.manifests[state])
+
+
+    def reset(self) -> None:
+        for thread in self.threads.values():
+            thread.join()
+
+        self.threads = {}
+        self.manifests = {}
+        self.progress = {}
+        self.manager.clear_prefetched()
+
+
+    def shutdown(self) -> None:
+        self.reset()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
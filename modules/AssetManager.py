@@ -0,0 +1,281 @@
+import pygame
+import os
+import json
+import threading
+import time
+from modules.AssetCache import asset_cache
+from modules.SurfaceStore import surface_store
+
+class AssetManager:
+    def __init__(self, cache = asset_cache, store = surface_store) -> None:
+        self.cache = cache
+        self.store = store
+
+        self.entries = {}
+        self.surface_keys = {}
+        self.handle_keys = {}
+
+        self.atlas_regions = {}
+        self.optimized = {}
+        self.alpha_hints = {}
+        self.native_masks = None
+
+        self.prefetched = {}
+        self.lock = threading.Lock()
+
+        self.load_times = {}
+
+
+    def get_key(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> tuple:
+        if self.cache.pack is not None:
+            source = self.cache.pack.get_path(source)
+        return (os.path.normcase(os.path.abspath(source)), (float(scale[0]), float(scale[1])), alpha if alpha == 'auto' else bool(alpha))
+
+
+    def get_alpha_mode(self, surface : pygame.Surface) -> tuple:
+        area = surface.get_width() * surface.get_height()
+        if pygame.mask.from_surface(surface, 254).count() == area:
+            return 'opaque', 255
+
+        alpha = surface.get_at((0, 0)).a
+        if alpha > 0 and pygame.mask.from_surface(surface, alpha - 1).count() == area and pygame.mask.from_surface(surface, alpha).count() == 0:
+            return 'uniform', alpha
+
+        return 'alpha', None
+
+
+    def is_native(self, surface : pygame.Surface) -> bool:
+        if self.native_masks is None:
+            self.native_masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+        return surface.get_bitsize() == 32 and surface.get_masks() == self.native_masks
+
+
+    def convert(self, surface : pygame.Surface, alpha = True, alpha_mode : tuple = None) -> pygame.Surface:
+        if alpha == 'auto':
+            mode, value = alpha_mode or self.get_alpha_mode(surface)
+            if mode == 'opaque':
+                return surface.convert()
+            if mode == 'colorkey':
+                surface = surface.convert()
+                surface.set_colorkey(value, pygame.RLEACCEL)
+                return surface
+            if mode == 'uniform':
+                surface = surface.convert()
+                surface.set_alpha(value, pygame.RLEACCEL)
+                return surface
+
+        if alpha and self.is_native(surface):
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+
+    def get_entry(self, source : str, scale : tuple, alpha) -> dict:
+        key = self.get_key(source, scale, alpha)
+
+        entry = self.entries.get(key)
+        if entry is None:
+            handle = self.store.put(self.load(key, source, alpha))
+            entry = {'handle': handle, 'refcount': 0, 'surfaces': 0}
+            self.entries[key] = entry
+            self.handle_keys[handle] = key
+
+        entry['refcount'] += 1
+        return entry
+
+
+    def acquire(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> pygame.Surface:
+        entry = self.get_entry(source, scale, alpha)
+        if entry['surfaces'] == 0:
+            self.store.pin(entry['handle'])
+        entry['surfaces'] += 1
+
+        surface = self.store.get(entry['handle'])
+        self.surface_keys[id(surface)] = self.handle_keys[entry['handle']]
+        return surface
+
+
+    def add_atlas(self, index_path : str) -> None:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+
+        directory = os.path.dirname(index_path)
+        image = os.path.join(directory, index['image'])
+        offsets = index.get('offsets', {})
+        for name, region in index['regions'].items():
+            self.atlas_regions[self.get_key(os.path.join(directory, name))[0]] = (image, pygame.Rect(region), tuple(offsets.get(name, (0, 0))))
+
+
+    def acquire_region(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> tuple:
+        region = self.atlas_regions.get(self.get_key(source)[0])
+        if region is None:
+            surface, offset = self.acquire_trimmed(source, scale, alpha)
+            return surface, None, offset
+
+        image, rect, offset = region
+        surface = self.acquire(image, scale, True)
+        area = pygame.Rect(round(rect.x * scale[0]), round(rect.y * scale[1]), round(rect.width * scale[0]), round(rect.height * scale[1]))
+        return surface, area.clip(surface.get_rect()), self.get_offset(offset, scale)
+
+
+    def add_optimized(self, index_path : str) -> None:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+
+        directory = os.path.dirname(index_path)
+        for name, entry in index['images'].items():
+            image = os.path.join(directory, entry['image'])
+            value = tuple(entry['value']) if isinstance(entry['value'], list) else entry['value']
+            self.optimized[self.get_key(os.path.join(directory, name))[0]] = (image, tuple(entry['offset']), tuple(entry['size']))
+            self.alpha_hints[self.get_key(image)[0]] = (entry['mode'], value)
+
+
+    def get_optimized(self, source : str, alpha = True) -> tuple:
+        optimized = self.optimized.get(self.get_key(source)[0])
+        if optimized is None:
+            return source, (0, 0), alpha
+        return optimized[0], optimized[1], 'auto'
+
+
+    def get_source_size(self, source : str, scale : tuple = (1.0, 1.0)) -> tuple:
+        optimized = self.optimized.get(self.get_key(source)[0])
+        if optimized is None:
+            return None
+        return (int(optimized[2][0] * scale[0]), int(optimized[2][1] * scale[1]))
+
+
+    def get_offset(self, offset : tuple, scale : tuple) -> tuple:
+        return (round(offset[0] * scale[0]), round(offset[1] * scale[1]))
+
+
+    def acquire_trimmed(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> tuple:
+        image, offset, alpha = self.get_optimized(source, alpha)
+        return self.acquire(image, scale, alpha), self.get_offset(offset, scale)
+
+
+    def acquire_trimmed_handle(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> tuple:
+        image, offset, alpha = self.get_optimized(source, alpha)
+        return self.acquire_handle(image, scale, alpha), self.get_offset(offset, scale)
+
+
+    def acquire_handle(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> int:
+        return self.get_entry(source, scale, alpha)['handle']
+
+
+    def get_surface(self, handle : int) -> pygame.Surface:
+        return self.store.get(handle)
+
+
+    def load(self, key : tuple, source : str, alpha = True) -> pygame.Surface:
+        start = time.perf_counter()
+        with self.lock:
+            raw = self.prefetched.pop(key, None)
+
+        if raw is None:
+            raw = self.cache.load_raw(source, key[1], alpha)
+
+        alpha_mode = self.alpha_hints.get(key[0])
+        if alpha_mode is None and self.cache.is_packed(source):
+            alpha_mode = self.cache.pack.get_alpha_mode(source)
+        surface = self.convert(raw, alpha, alpha_mode)
+        self.load_times[key] = self.load_times.get(key, 0.0) + time.perf_counter() - start
+        return surface
+
+
+    def needs_prefetch(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> bool:
+        key = self.get_key(source, scale, alpha)
+
+        with self.lock:
+            return not (key in self.entries or key in self.prefetched)
+
+
+    def store_prefetched(self, source : str, scale : tuple, alpha, raw : pygame.Surface, seconds : float) -> None:
+        key = self.get_key(source, scale, alpha)
+
+        with self.lock:
+            self.prefetched.setdefault(key, raw)
+            self.load_times[key] = seconds
+
+
+    def prefetch(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> None:
+        if not self.needs_prefetch(source, scale, alpha):
+            return None
+
+        start = time.perf_counter()
+        raw = self.cache.load_raw(source, self.get_key(source, scale, alpha)[1], alpha)
+        self.store_prefetched(source, scale, alpha, raw, time.perf_counter() - start)
+
+
+    def clear_prefetched(self) -> None:
+        with self.lock:
+            self.prefetched.clear()
+
+
+    def release(self, surface : pygame.Surface) -> None:
+        key = self.surface_keys.get(id(surface))
+        if key is None:
+            return None
+
+        entry = self.entries[key]
+        entry['surfaces'] -= 1
+        if entry['surfaces'] <= 0:
+            del self.surface_keys[id(surface)]
+            self.store.unpin(entry['handle'])
+        self.release_handle(entry['handle'])
+
+
+    def release_handle(self, handle : int) -> None:
+        key = self.handle_keys.get(handle)
+        if key is None:
+            self.store.remove(handle)
+            return None
+
+        entry = self.entries[key]
+        entry['refcount'] -= 1
+        if entry['refcount'] <= 0:
+            del self.entries[key]
+            del self.handle_keys[handle]
+            self.store.remove(handle)
+
+
+    def get_refcount(self, source : str, scale : tuple = (1.0, 1.0), alpha : bool = True) -> int:
+        entry = self.entries.get(self.get_key(source, scale, alpha))
+        return entry['refcount'] if entry is not None else 0
+
+
+    def get_surface_bytes(self, surface : pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+
+    def get_resident_bytes(self) -> int:
+        return self.store.hot_bytes + self.store.cold_bytes
+
+
+    def get_report(self) -> list:
+        report = []
+        for (path, scale, alpha), entry in self.entries.items():
+            handle = entry['handle']
+            stored = self.store.entries[handle]
+            if self.store.is_pinned(handle):
+                state = 'pinned'
+            else:
+                state = 'hot' if stored['surface'] is not None else 'cold'
+            report.append({
+                'path': path,
+                'scale': scale,
+                'alpha': alpha,
+                'size': stored['size'],
+                'refcount': entry['refcount'],
+                'bytes': stored['bytes'] if stored['surface'] is not None else len(stored['data']),
+                'state': state,
+            })
+        report.sort(key=lambda item: item['bytes'], reverse=True)
+        return report
+
+
+    def print_report(self) -> None:
+        for item in self.get_report():
+            print(f"{item['bytes'] / 1048576:8.2f} MB  x{item['refcount']}  {item['state']:6}  {item['size'][0]}x{item['size'][1]}  {os.path.basename(item['path'])}")
+        print(f"{self.get_resident_bytes() / 1048576:8.2f} MB total in {len(self.entries)} surfaces")
+
+
+asset_manager = AssetManager()
@@ -0,0 +1,118 @@
+import os
+import mmap
+import json
+import zlib
+import struct
+import pygame
+
+class AssetPack:
+    MAGIC = b'FN7P'
+    VERSION = 1
+    HEADER = struct.Struct('<4sII')
+    ALIGNMENT = 64
+
+    def __init__(self) -> None:
+        self.path = None
+        self.base = None
+        self.file = None
+        self.map = None
+        self.index = {}
+        self.stamp = None
+
+        self.loads = 0
+        self.mapped_bytes = 0
+        self.inflated_bytes = 0
+
+
+    def open(self, path : str) -> bool:
+        self.close()
+        try:
+            self.file = open(path, 'rb')
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+            magic, version, index_size = self.HEADER.unpack_from(self.map)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(f"unsupported pack format {magic!r} v{version}")
+
+            self.index = json.loads(bytes(self.map[self.HEADER.size:self.HEADER.size + index_size]))
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Something went wrong while opening asset pack '{path}', using loose files: {e}")
+            self.close()
+            return False
+
+        stat = os.stat(path)
+        self.path = path
+        self.base = os.path.dirname(os.path.abspath(path))
+        self.stamp = f"{stat.st_mtime_ns}|{stat.st_size}"
+        return True
+
+
+    def close(self) -> None:
+        if self.map is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                pass
+        if self.file is not None:
+            self.file.close()
+
+        self.path = None
+        self.base = None
+        self.file = None
+        self.map = None
+        self.index = {}
+
+
+    def is_open(self) -> bool:
+        return self.map is not None
+
+
+    def resolve(self, source : str) -> str:
+        if not self.index:
+            return None
+        if source in self.index:
+            return source
+
+        key = os.path.relpath(os.path.abspath(source), self.base).replace(os.sep, '/')
+        return key if key in self.index else None
+
+
+    def get_path(self, source : str) -> str:
+        key = self.resolve(source)
+        return os.path.join(self.base, key) if key is not None else source
+
+
+    def get_alpha_mode(self, source : str) -> tuple:
+        key = self.resolve(source)
+        if key is None:
+            return None
+        entry = self.index[key]
+        return entry['alpha_mode'], entry['alpha_value']
+
+
+    def load(self, source : str) -> pygame.Surface:
+        entry = self.index[self.resolve(source)]
+        start = entry['offset']
+        data = memoryview(self.map)[start:start + entry['length']]
+
+        if entry['compression'] == 'zlib':
+            data = zlib.decompress(data)
+            self.inflated_bytes += len(data)
+        else:
+            self.mapped_bytes += len(data)
+
+        self.loads += 1
+        return pygame.image.frombuffer(data, tuple(entry['size']), entry['format'])
+
+
+    def get_stats(self) -> dict:
+        return {
+            'entries': len(self.index),
+            'loads': self.loads,
+            'mapped_bytes': self.mapped_bytes,
+            'inflated_bytes': self.inflated_bytes,
+            'file_bytes': os.path.getsize(self.path) if self.path else 0,
+        }
+
+
+asset_pack = AssetPack()
@@ -1,4 +1,5 @@
 import pygame
+from modules.AssetManager import asset_manager
 
 class Button:
     def __init__(self, x : int, y : int, width : int, height : int, source : str, hover_source = None, resolution = (1920, 1080)) -> None:
@@ -12,30 +13,59 @@ class Button:
         self.source = source
         self.hover_source = hover_source
 
-        self.clicked = False
         self.hovered = False
+        self.on_click = None
 
-        self.image = pygame.transform.scale_by(pygame.image.load(self.source).convert_alpha(), (self.scale_x, self.scale_y))
+        self.image, self.image_area, self.image_offset = asset_manager.acquire_region(self.source, (self.scale_x, self.scale_y))
         if self.hover_source is not None:
-            self.hover_image = pygame.transform.scale_by(pygame.image.load(self.hover_source).convert_alpha(), (self.scale_x, self.scale_y))
+            self.hover_image, self.hover_area, self.hover_offset = asset_manager.acquire_region(self.hover_source, (self.scale_x, self.scale_y))
 
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
 
 
-    def get_clicked(self, mx, my, btn):
-        if self.rect.collidepoint(mx, my):
-            if pygame.mouse.get_pressed()[btn] and self.clicked == False:
-                self.clicked = True
-                return True
-        if pygame.mouse.get_pressed()[btn] == 0:
-            self.clicked = False
-            return False
-        
-
-    def draw(self, screen, mx, my):
-        if self.rect.collidepoint(mx, my) and self.hover_source is not None:
-            screen.blit(self.hover_image, (self.x, self.y))
-            self.hovered = True
+    def on_enter(self, buttons) -> None:
+        self.hovered = True
+
+
+    def on_leave(self) -> None:
+        self.hovered = False
+
+
+    def on_press(self, btn) -> None:
+        if btn == 0 and self.on_click is not None:
+            self.on_click()
+
+
+    def set_resolution(self, resolution) -> None:
+        scale_x = float(float(resolution[0]) / 1920.0)
+        scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.x = self.x / self.scale_x * scale_x
+        self.y = self.y / self.scale_y * scale_y
+        self.width = self.width / self.scale_x * scale_x
+        self.height = self.height / self.scale_y * scale_y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+
+        image = asset_manager.acquire_region(self.source, (self.scale_x, self.scale_y))
+        if self.hover_source is not None:
+            hover_image = asset_manager.acquire_region(self.hover_source, (self.scale_x, self.scale_y))
+        self.release()
+        self.image, self.image_area, self.image_offset = image
+        if self.hover_source is not None:
+            self.hover_image, self.hover_area, self.hover_offset = hover_image
+
+        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+
+
+    def release(self) -> None:
+        asset_manager.release(self.image)
+        if self.hover_source is not None:
+            asset_manager.release(self.hover_image)
+
+
+    def draw(self, screen):
+        if self.hovered and self.hover_source is not None:
+            screen.blit(self.hover_image, (self.x + self.hover_offset[0], self.y + self.hover_offset[1]), self.hover_area)
         else:
-            screen.blit(self.image, (self.x, self.y))
-            self.hovered = False
\ No newline at end of file
+            screen.blit(self.image, (self.x + self.image_offset[0], self.y + self.image_offset[1]), self.image_area)
\ No newline at end of file
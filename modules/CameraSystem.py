@@ -0,0 +1,212 @@
+import pygame
+from modules.FeedCache import FeedCache
+from modules.FontCache import font_cache
+from modules.InvisibleButton import InvisibleButton
+
+class CameraSystem:
+    def __init__(self, cameras : list, flip, resolution = (1920, 1080), budget : int = 48 * 1048576,
+                 button_size : tuple = (96, 48), font_name : str = 'Arial', font_size : int = 22) -> None:
+        self.scale_x = float(float(resolution[0]) / 1920.0)
+        self.scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.cameras = cameras
+        self.flip = flip
+        self.button_size = button_size
+        self.font_name = font_name
+        self.font_size = font_size
+
+        self.rooms = [camera['room'] for camera in self.cameras]
+        self.feeds = FeedCache(budget, (self.scale_x, self.scale_y))
+        self.buttons = [InvisibleButton(camera['map'][0], camera['map'][1], button_size[0], button_size[1], resolution) for camera in self.cameras]
+
+        self.current = 0
+        self.state = 'down'
+        self.occupants = {}
+
+        self.map_surface = None
+        self.map_rect = None
+        self.map_key = None
+
+        self.prefetch()
+
+
+    def reset(self) -> None:
+        self.current = 0
+        self.state = 'down'
+        self.occupants = {}
+        self.flip.unpin()
+        self.flip.restart()
+        self.prefetch()
+
+
+    def is_up(self) -> bool:
+        return self.state == 'up'
+
+
+    def is_down(self) -> bool:
+        return self.state == 'down'
+
+
+    def is_flipping(self) -> bool:
+        return self.state in ('flipping_up', 'flipping_down')
+
+
+    def get_room(self) -> str:
+        return self.rooms[self.current]
+
+
+    def get_adjacent(self, index : int) -> list:
+        return [self.rooms.index(room) for room in self.cameras[index]['links']]
+
+
+    def get_source(self, index : int) -> str:
+        camera = self.cameras[index]
+        for name in self.occupants.get(camera['room'], ()):
+            if name in camera['variants']:
+                return camera['variants'][name]
+        return camera['source']
+
+
+    def set_occupants(self, occupants : dict) -> None:
+        if occupants != self.occupants:
+            self.occupants = occupants
+            self.prefetch()
+
+
+    def prefetch(self) -> None:
+        sources = [self.get_source(self.current)]
+        for index in self.get_adjacent(self.current):
+            source = self.get_source(index)
+            if source not in sources:
+                sources.append(source)
+        self.feeds.prefetch(sources)
+
+
+    def select(self, index : int) -> None:
+        if index != self.current:
+            self.current = index
+            self.prefetch()
+
+
+    def open(self) -> None:
+        if self.state == 'down':
+            self.flip.pin()
+            self.flip.restart(0)
+        elif self.state == 'flipping_down':
+            self.flip.restart(self.flip.frame)
+        else:
+            return None
+
+        self.state = 'flipping_up'
+        self.prefetch()
+
+
+    def close(self) -> None:
+        if self.state == 'up':
+            self.flip.restart(len(self.flip.frames) - 1)
+        elif self.state == 'flipping_up':
+            self.flip.restart(self.flip.frame)
+        else:
+            return None
+
+        self.state = 'flipping_down'
+
+
+    def update(self) -> None:
+        if self.state == 'flipping_up':
+            self.flip.update_once()
+            if self.flip.frame == len(self.flip.frames) - 1:
+                self.state = 'up'
+        elif self.state == 'flipping_down':
+            self.flip.update_reverse()
+            if self.flip.frame == 0:
+                self.state = 'down'
+                self.flip.unpin()
+        elif self.state == 'up':
+            for index, button in enumerate(self.buttons):
+                if button.get_clicked():
+                    self.select(index)
+
+        self.feeds.collect()
+
+
+    def get_view_key(self) -> tuple:
+        source = self.get_source(self.current)
+        return (self.state, self.flip.frame if self.is_flipping() else None, self.current, source, self.feeds.is_ready(source))
+
+
+    def get_wait_time(self, max_wait : int) -> int:
+        if self.is_flipping():
+            return min(self.flip.get_time_to_next_frame(), max_wait)
+        if self.feeds.pending:
+            return min(10, max_wait)
+        return max_wait
+
+
+    def build_map(self) -> None:
+        width = max(camera['map'][0] for camera in self.cameras) + self.button_size[0]
+        height = max(camera['map'][1] for camera in self.cameras) + self.button_size[1]
+        left = min(camera['map'][0] for camera in self.cameras)
+        top = min(camera['map'][1] for camera in self.cameras)
+
+        self.map_rect = pygame.Rect(left * self.scale_x, top * self.scale_y, (width - left) * self.scale_x, (height - top) * self.scale_y)
+        self.map_surface = pygame.Surface(self.map_rect.size, pygame.SRCALPHA)
+
+        rects = [button.rect.move(-self.map_rect.x, -self.map_rect.y) for button in self.buttons]
+        line_width = max(1, int(3 * self.scale_x))
+        for index, camera in enumerate(self.cameras):
+            for other in self.get_adjacent(index):
+                if other > index:
+                    pygame.draw.line(self.map_surface, (200, 200, 200, 160), rects[index].center, rects[other].center, line_width)
+
+        font = font_cache.get_font(self.font_name, int(self.font_size * self.scale_x))
+        for index, camera in enumerate(self.cameras):
+            color = (60, 160, 60, 230) if index == self.current else (40, 40, 40, 230)
+            pygame.draw.rect(self.map_surface, color, rects[index])
+            pygame.draw.rect(self.map_surface, (220, 220, 220, 255), rects[index], line_width)
+
+            label = font_cache.render(font, camera['name'], True, (255, 255, 255))
+            self.map_surface.blit(label, label.get_rect(center=rects[index].center))
+
+        self.map_key = self.current
+
+
+    def set_resolution(self, resolution) -> None:
+        self.scale_x = float(float(resolution[0]) / 1920.0)
+        self.scale_y = float(float(resolution[1]) / 1080.0)
+
+        for button in self.buttons:
+            button.set_resolution(resolution)
+
+        self.feeds.set_scale((self.scale_x, self.scale_y))
+        self.map_key = None
+        self.prefetch()
+
+
+    def release(self) -> None:
+        self.feeds.shutdown()
+
+
+    def draw_feed(self, screen : pygame.Surface) -> None:
+        if self.state != 'up':
+            return None
+
+        feed = self.feeds.get(self.get_source(self.current))
+        if feed is not None:
+            screen.blit(feed, (0, 0))
+        else:
+            screen.fill((0, 0, 0))
+
+
+    def draw_flip(self, screen : pygame.Surface) -> None:
+        if self.is_flipping():
+            self.flip.draw_ready(screen)
+
+
+    def draw_map(self, screen : pygame.Surface) -> None:
+        if self.state != 'up':
+            return None
+
+        if self.map_key != self.current:
+            self.build_map()
+        screen.blit(self.map_surface, self.map_rect)
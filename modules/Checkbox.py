@@ -1,8 +1,9 @@
 import pygame
 from modules.Text import Text
+from modules.AssetManager import asset_manager
 
 class Checkbox:
-    def __init__(self, x : int, y : int, width : int, height : int, font_name : str, font_size : int, resolution = (1920, 1080), checked_offset_x = 0, checked_offset_y = 0) -> None:
+    def __init__(self, x : int, y : int, width : int, height : int, font_name : str, font_size : int, resolution = (1920, 1080), checked_offset_x = 0, checked_offset_y = 0, source : str = None, checked_source : str = None) -> None:
         self.scale_x = float(float(resolution[0]) / 1920.0)
         self.scale_y = float(float(resolution[1]) / 1080.0)
 
@@ -14,28 +15,83 @@ class Checkbox:
         self.font_name = font_name
         self.font_size = font_size
 
-        self.clicked = False
         self.state = False
+        self.on_change = None
     
         self.text = Text(self.x + checked_offset_x, self.y + checked_offset_y, self.font_name, self.font_size, " ", (255,255,255), resolution)
         self.checked_text = Text(self.x + checked_offset_x, self.y + checked_offset_y, self.font_name, self.font_size, "X", (255,255,255), resolution)
 
         self.rect = pygame.Rect(self.x * self.scale_x, self.y * self.scale_y, self.width, self.height)
 
+        self.source = source
+        self.checked_source = checked_source
+        self.images = []
+        self.areas = []
+        self.offsets = []
+        if self.source is not None and self.checked_source is not None:
+            self.acquire_images()
+
+        self.dirty = True
+
+
+    def acquire_images(self):
+        try:
+            regions = [asset_manager.acquire_region(source, (self.scale_x, self.scale_y)) for source in (self.source, self.checked_source)]
+        except:
+            print(f"Something went wrong while adding images using '{self.source}' and '{self.checked_source}'")
+            return None
+
+        self.release()
+        self.images = [image for image, _, _ in regions]
+        self.areas = [area for _, area, _ in regions]
+        self.offsets = [offset for _, _, offset in regions]
+
+
+    def release(self):
+        for image in self.images:
+            asset_manager.release(image)
+        self.images = []
+        self.areas = []
+        self.offsets = []
+
+
+    def set_resolution(self, resolution):
+        scale_x = float(float(resolution[0]) / 1920.0)
+        scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.width = self.width / self.scale_x * scale_x
+        self.height = self.height / self.scale_y * scale_y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+
+        self.text.set_resolution(resolution)
+        self.checked_text.set_resolution(resolution)
+
+        self.rect = pygame.Rect(self.x * self.scale_x, self.y * self.scale_y, self.width, self.height)
+        if self.images:
+            self.acquire_images()
+        self.dirty = True
+
+
+    def on_press(self, btn):
+        if btn != 0:
+            return None
+
+        self.state = not self.state
+        self.dirty = True
+        if self.on_change is not None:
+            self.on_change(self.state)
+
+
+    def get_dirty_rects(self):
+        return [self.rect.union(self.checked_text.get_rect()).union(self.text.get_rect())]
 
-    def get_check_state(self, mx, my, btn):
-        if self.rect.collidepoint(mx, my):
-            if pygame.mouse.get_pressed()[btn] and self.clicked == False:
-                self.clicked = True
-                self.state = not self.state
-                return self.state
-        if pygame.mouse.get_pressed()[btn] == 0:
-            self.clicked = False
-            return self.state
-        
 
     def draw(self, screen):
-        if self.state:
+        if self.images:
+            screen.blit(self.images[int(self.state)], self.rect.move(self.offsets[int(self.state)]), self.areas[int(self.state)])
+            pygame.draw.rect(screen, (255,255,255), self.rect, 2)
+        elif self.state:
             self.checked_text.draw_text(screen)
             pygame.draw.rect(screen, (255,255,255), self.rect, 2)
         else:
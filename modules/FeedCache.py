@@ -0,0 +1,176 @@
+import sys
+import time
+import pygame
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from modules.AssetCache import asset_cache
+from modules.AssetManager import asset_manager
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class FeedCache:
+    def __init__(self, budget : int = 48 * 1048576, scale : tuple = (1.0, 1.0), workers : int = 1, cache = asset_cache, manager = asset_manager) -> None:
+        self.budget = budget
+        self.scale = (float(scale[0]), float(scale[1]))
+        self.workers = workers
+        self.cache = cache
+        self.manager = manager
+        self.pool = None
+
+        self.entries = OrderedDict()
+        self.resident_bytes = 0
+        self.pending = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.waiting_frames = 0
+        self.evictions = 0
+        self.prefetches = 0
+        self.decode_time = 0.0
+
+
+    def get_pool(self):
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix='FeedCache')
+        return self.pool
+
+
+    def set_budget(self, budget : int) -> None:
+        self.budget = budget
+        self.trim()
+
+
+    def set_scale(self, scale : tuple) -> None:
+        scale = (float(scale[0]), float(scale[1]))
+        if scale != self.scale:
+            self.scale = scale
+            self.clear()
+
+
+    def get_surface_bytes(self, surface : pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+
+    def swizzle(self, raw : pygame.Surface) -> pygame.Surface:
+        if numpy is None or sys.byteorder != 'little' or raw.get_bytesize() != 4 or not raw.get_masks()[3] or self.manager.is_native(raw):
+            return raw
+
+        shifts = [mask.bit_length() - 8 for mask in raw.get_masks()]
+        native = [mask.bit_length() - 8 for mask in self.manager.native_masks]
+        layout = ''.join('RGBA'[native.index(shift)] for shift in range(0, 32, 8))
+
+        width, height = raw.get_size()
+        pixels = numpy.frombuffer(raw.get_buffer(), numpy.uint8).reshape(height, raw.get_pitch())[:, :width * 4].reshape(height, width, 4)
+        swizzled = numpy.empty_like(pixels)
+        for channel in range(4):
+            swizzled[..., native[channel] // 8] = pixels[..., shifts[channel] // 8]
+        return pygame.image.frombuffer(swizzled, (width, height), layout)
+
+
+    def decode(self, source : str, scale : tuple) -> tuple:
+        start = time.perf_counter()
+        raw = self.swizzle(self.cache.load_raw(source, scale, True))
+        return scale, raw, time.perf_counter() - start
+
+
+    def request(self, source : str) -> None:
+        if source in self.entries or source in self.pending:
+            return None
+        self.pending[source] = self.get_pool().submit(self.decode, source, self.scale)
+
+
+    def collect(self) -> None:
+        for source, future in list(self.pending.items()):
+            if not future.done():
+                continue
+
+            del self.pending[source]
+            if future.cancelled():
+                continue
+
+            try:
+                scale, raw, seconds = future.result()
+            except Exception as e:
+                print(f"Something went wrong while loading camera feed '{source}': {e}")
+                continue
+
+            if scale != self.scale:
+                continue
+
+            surface = self.manager.convert(raw, True)
+            self.entries[source] = surface
+            self.resident_bytes += self.get_surface_bytes(surface)
+            self.decode_time += seconds
+            self.trim()
+
+
+    def get(self, source : str) -> pygame.Surface:
+        self.collect()
+
+        surface = self.entries.get(source)
+        if surface is None:
+            if source not in self.pending:
+                self.misses += 1
+                self.request(source)
+            self.waiting_frames += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(source)
+        return surface
+
+
+    def is_ready(self, source : str) -> bool:
+        return source in self.entries
+
+
+    def prefetch(self, sources : list) -> None:
+        for source, future in list(self.pending.items()):
+            if source not in sources and future.cancel():
+                del self.pending[source]
+
+        for source in sources:
+            if source not in self.entries and source not in self.pending:
+                self.prefetches += 1
+                self.request(source)
+
+
+    def trim(self) -> None:
+        while self.resident_bytes > self.budget and len(self.entries) > 1:
+            source, surface = self.entries.popitem(last=False)
+            self.resident_bytes -= self.get_surface_bytes(surface)
+            self.evictions += 1
+
+
+    def clear(self) -> None:
+        for future in self.pending.values():
+            future.cancel()
+        self.pending = {}
+        self.entries = OrderedDict()
+        self.resident_bytes = 0
+
+
+    def shutdown(self) -> None:
+        self.clear()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.waiting_frames
+        return {
+            'feeds': len(self.entries),
+            'pending': len(self.pending),
+            'resident_bytes': self.resident_bytes,
+            'budget': self.budget,
+            'hit_rate': self.hits / total if total else 0.0,
+            'misses': self.misses,
+            'waiting_frames': self.waiting_frames,
+            'evictions': self.evictions,
+            'prefetches': self.prefetches,
+            'decode_ms': self.decode_time * 1000.0,
+        }
@@ -0,0 +1,100 @@
+import os
+import json
+import pygame
+from collections import OrderedDict
+
+class FontCache:
+    def __init__(self, text_capacity : int = 256) -> None:
+        self.fonts = {}
+        self.texts = OrderedDict()
+        self.text_capacity = text_capacity
+
+        self.paths = {}
+        self.paths_changed = False
+        self.scans = 0
+
+        self.font_hits = 0
+        self.font_misses = 0
+        self.text_hits = 0
+        self.text_misses = 0
+
+
+    def load_paths(self, path : str) -> None:
+        try:
+            with open(path, "r") as f:
+                paths = json.load(f)
+            self.paths = {key: value for key, value in paths.items() if value is None or isinstance(value, str)}
+        except FileNotFoundError:
+            pass
+        except:
+            print(f"Something went wrong while loading the font path cache '{path}'")
+
+
+    def get_paths(self) -> dict:
+        self.paths_changed = False
+        return dict(self.paths)
+
+
+    def find_font(self, name : str, bold : bool = False, italic : bool = False) -> str:
+        key = f"{name}|{int(bold)}|{int(italic)}"
+
+        if key in self.paths:
+            path = self.paths[key]
+            if path is None or os.path.exists(path):
+                return path
+
+        self.scans += 1
+        path = pygame.font.match_font(name, bold, italic)
+        self.paths[key] = path
+        self.paths_changed = True
+        return path
+
+
+    def get_font(self, name : str, size : int, bold : bool = False, italic : bool = False) -> pygame.font.Font:
+        key = (name, size, bold, italic)
+
+        font = self.fonts.get(key)
+        if font is None:
+            self.font_misses += 1
+            path = self.find_font(name, bold, italic)
+            font = pygame.font.Font(path, size)
+            if path is None:
+                font.set_bold(bold)
+                font.set_italic(italic)
+            self.fonts[key] = font
+        else:
+            self.font_hits += 1
+
+        return font
+
+
+    def render(self, font : pygame.font.Font, text : str, antialias : bool, color) -> pygame.Surface:
+        key = (id(font), text, antialias, tuple(color))
+
+        surface = self.texts.get(key)
+        if surface is None:
+            self.text_misses += 1
+            surface = font.render(text, antialias, color)
+            self.texts[key] = surface
+            if len(self.texts) > self.text_capacity:
+                self.texts.popitem(last=False)
+        else:
+            self.text_hits += 1
+            self.texts.move_to_end(key)
+
+        return surface
+
+
+    def get_stats(self) -> dict:
+        font_total = self.font_hits + self.font_misses
+        text_total = self.text_hits + self.text_misses
+        return {
+            'fonts': len(self.fonts),
+            'font_scans': self.scans,
+            'font_hit_rate': self.font_hits / font_total if font_total else 0.0,
+            'texts': len(self.texts),
+            'text_hit_rate': self.text_hits / text_total if text_total else 0.0,
+        }
+
+
+font_cache = FontCache()
@@ -0,0 +1,84 @@
+import pygame
+
+class FrameClock:
+    FRAME_CAPS = (240, 144, 120, 90, 60, 45, 30)
+
+    def __init__(self, tick_rate : int = 144, max_fps : int = 144, min_fps : int = 30, idle_fps : int = 30, idle_after : int = 30) -> None:
+        self.clock = pygame.time.Clock()
+
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000.0 / tick_rate
+        self.max_frame_ms = 250.0
+        self.accumulator = 0.0
+
+        self.frame_caps = [cap for cap in self.FRAME_CAPS if min_fps <= cap < max_fps]
+        self.frame_caps.insert(0, max_fps)
+        self.cap_index = 0
+
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after
+        self.idle_frames = 0
+
+        self.adapt_every = 60
+        self.work_times = []
+
+
+    def is_idle(self) -> bool:
+        return self.idle_frames >= self.idle_after
+
+
+    def get_frame_cap(self) -> int:
+        if self.is_idle():
+            return min(self.idle_fps, self.frame_caps[self.cap_index])
+        return self.frame_caps[self.cap_index]
+
+
+    def tick(self) -> float:
+        dt = self.clock.tick(self.get_frame_cap())
+        self.adapt(self.clock.get_rawtime())
+        return dt
+
+
+    def adapt(self, work_ms : float) -> None:
+        if self.is_idle():
+            return None
+
+        self.work_times.append(work_ms)
+        if len(self.work_times) < self.adapt_every:
+            return None
+
+        average = sum(self.work_times) / len(self.work_times)
+        self.work_times = []
+
+        budget = 1000.0 / self.frame_caps[self.cap_index]
+        if average > budget * 0.9 and self.cap_index < len(self.frame_caps) - 1:
+            self.cap_index += 1
+        elif self.cap_index > 0 and average < (1000.0 / self.frame_caps[self.cap_index - 1]) * 0.5:
+            self.cap_index -= 1
+
+
+    def set_idle(self, idle : bool) -> None:
+        if idle:
+            self.idle_frames += 1
+        else:
+            self.idle_frames = 0
+
+
+    def advance(self, dt : float) -> int:
+        self.accumulator += min(dt, self.max_frame_ms)
+
+        ticks = int(self.accumulator // self.tick_ms)
+        self.accumulator -= ticks * self.tick_ms
+        return ticks
+
+
+    def get_alpha(self) -> float:
+        return self.accumulator / self.tick_ms
+
+
+    def reset(self) -> None:
+        self.accumulator = 0.0
+
+
+    def get_fps(self) -> float:
+        return self.clock.get_fps()
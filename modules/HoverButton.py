@@ -1,4 +1,5 @@
 import pygame
+from modules.AssetManager import asset_manager
 
 class HoverButton:
     def __init__(self, x : int, y : int, width : int, height : int, source : str = None, resolution = (1920, 1080)) -> None:
@@ -17,10 +18,17 @@ class HoverButton:
         self.state = 0
 
         self.images = []
+        self.areas = []
+        self.offsets = []
+        self.image_sources = []
 
         if source is not None:
             try:
-                self.images.append(pygame.transform.scale_by(pygame.image.load(self.source).convert_alpha(), (self.scale_x, self.scale_y)))
+                image, area, offset = asset_manager.acquire_region(self.source, (self.scale_x, self.scale_y))
+                self.images.append(image)
+                self.areas.append(area)
+                self.offsets.append(offset)
+                self.image_sources.append((self.source, True))
             except:
                 print(f"Something went wrong while adding image using '{source}'")
 
@@ -37,32 +45,62 @@ class HoverButton:
 
     def add_image(self, source : str) -> None:
         try:
-            self.images.append(pygame.image.load(source))
+            image, area, offset = asset_manager.acquire_region(source)
+            self.images.append(image)
+            self.areas.append(area)
+            self.offsets.append(offset)
+            self.image_sources.append((source, False))
         except:
             print(f"Something went wrong while adding image using '{source}'")
 
 
-    def update(self) -> None:
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+    def release(self) -> None:
+        for image in self.images:
+            asset_manager.release(image)
+        self.images = []
+        self.areas = []
+        self.offsets = []
 
-        if not self.enabled:
-            return None
-        
-        if self.rect.collidepoint(mouse_x, mouse_y):
-            if self.state == 0:
-                self.state = 1
-                self.value = not self.value
-        else:
-            self.state = 0
+
+    def set_resolution(self, resolution) -> None:
+        scale_x = float(float(resolution[0]) / 1920.0)
+        scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.x = self.x / self.scale_x * scale_x
+        self.y = self.y / self.scale_y * scale_y
+        self.width = self.width / self.scale_x * scale_x
+        self.height = self.height / self.scale_y * scale_y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+
+        regions = []
+        for source, scaled in self.image_sources:
+            regions.append(asset_manager.acquire_region(source, (self.scale_x, self.scale_y) if scaled else (1.0, 1.0)))
+        self.release()
+        self.images = [image for image, _, _ in regions]
+        self.areas = [area for _, area, _ in regions]
+        self.offsets = [offset for _, _, offset in regions]
+
+        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+
+
+    def on_enter(self, buttons) -> None:
+        if self.enabled and self.state == 0:
+            self.state = 1
+            self.value = not self.value
+
+
+    def on_leave(self) -> None:
+        self.state = 0
 
 
     def draw(self, screen : pygame.surface, image_number : int = None) -> None:
         if self.source is not None:
             if not self.state:
-                if image_number is not None and image_number < len(self.images):
-                    screen.blit(self.images[image_number], (self.x, self.y))
-                else:
-                    screen.blit(self.images[0], (self.x, self.y))
+                if image_number is None or image_number >= len(self.images):
+                    image_number = 0
+                offset_x, offset_y = self.offsets[image_number]
+                screen.blit(self.images[image_number], (self.x + offset_x, self.y + offset_y), self.areas[image_number])
         else:
             if self.state:
                 pygame.draw.rect(screen, self.color, self.rect)
@@ -0,0 +1,120 @@
+import pygame
+
+class InputDispatcher:
+    def __init__(self, cell_size : int = 128) -> None:
+        self.cell_size = cell_size
+
+        self.layers = {}
+        self.state = None
+        self.grid = {}
+        self.scrolled_grid = {}
+        self.scroll_x = 0
+        self.scroll_transform = None
+
+        self.mouse_pos = pygame.mouse.get_pos()
+        self.buttons = [False, False, False]
+        self.hovered = None
+        self.pressed_targets = {}
+
+
+    def set_widgets(self, state : str, widgets : list, scrolled : list = ()) -> None:
+        self.layers[state] = [(widget, True) for widget in scrolled] + [(widget, False) for widget in widgets]
+        if state == self.state:
+            self.rebuild()
+
+
+    def set_state(self, state : str) -> None:
+        if state == self.state:
+            return None
+
+        self.set_hovered(None)
+        self.pressed_targets = {}
+        self.state = state
+        self.rebuild()
+
+
+    def set_scroll(self, scroll_x : float) -> None:
+        if scroll_x != self.scroll_x:
+            self.scroll_x = scroll_x
+            self.refresh()
+
+
+    def set_scroll_transform(self, transform) -> None:
+        self.scroll_transform = transform
+        self.refresh()
+
+
+    def rebuild(self) -> None:
+        self.grid = {}
+        self.scrolled_grid = {}
+        for index, (widget, scrolled) in enumerate(self.layers.get(self.state, ())):
+            grid = self.scrolled_grid if scrolled else self.grid
+            rect = widget.rect
+            for cell_x in range(rect.left // self.cell_size, rect.right // self.cell_size + 1):
+                for cell_y in range(rect.top // self.cell_size, rect.bottom // self.cell_size + 1):
+                    grid.setdefault((cell_x, cell_y), []).append((index, widget))
+
+        self.refresh()
+
+
+    def hit_test(self, x : int, y : int):
+        scrolled_x, scrolled_y = self.scroll_transform(x, y) if self.scroll_transform is not None else (x, y)
+
+        found = None
+        for grid, world_x, world_y in ((self.grid, x, y), (self.scrolled_grid, int(scrolled_x - self.scroll_x), int(scrolled_y))):
+            for index, widget in grid.get((world_x // self.cell_size, world_y // self.cell_size), ()):
+                if widget.rect.collidepoint(world_x, world_y) and (found is None or index > found[0]):
+                    found = (index, widget)
+        return found[1] if found is not None else None
+
+
+    def set_hovered(self, widget) -> None:
+        if widget is self.hovered:
+            return None
+
+        if self.hovered is not None and hasattr(self.hovered, 'on_leave'):
+            self.hovered.on_leave()
+        self.hovered = widget
+        if widget is not None and hasattr(widget, 'on_enter'):
+            widget.on_enter(tuple(self.buttons))
+
+
+    def poll(self, timeout : int = 0) -> list:
+        events = []
+        if timeout > 0:
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                events.append(event)
+        events += pygame.event.get()
+
+        unhandled = []
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                self.mouse_pos = event.pos
+                self.set_hovered(self.hit_test(*event.pos))
+
+            elif event.type == pygame.MOUSEBUTTONDOWN and 1 <= event.button <= 3:
+                self.mouse_pos = event.pos
+                self.buttons[event.button - 1] = True
+                target = self.hit_test(*event.pos)
+                self.set_hovered(target)
+                if target is not None:
+                    self.pressed_targets[event.button] = target
+                    if hasattr(target, 'on_press'):
+                        target.on_press(event.button - 1)
+
+            elif event.type == pygame.MOUSEBUTTONUP and 1 <= event.button <= 3:
+                self.mouse_pos = event.pos
+                self.buttons[event.button - 1] = False
+                target = self.pressed_targets.pop(event.button, None)
+                if target is not None and hasattr(target, 'on_release'):
+                    target.on_release(event.button - 1)
+
+            else:
+                unhandled.append(event)
+
+        return unhandled
+
+
+    def refresh(self) -> None:
+        self.set_hovered(self.hit_test(*self.mouse_pos))
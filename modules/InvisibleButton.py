@@ -13,13 +13,33 @@ class InvisibleButton:
 
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
 
-    def update(self, mx, my):
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        if self.rect.collidepoint(mx, my) and pygame.mouse.get_pressed()[0]:
+    def on_enter(self, buttons):
+        self.is_clicked = buttons[0]
+
+    def on_leave(self):
+        self.is_clicked = False
+
+    def on_press(self, btn):
+        if btn == 0:
             self.is_clicked = True
-        else:
+
+    def on_release(self, btn):
+        if btn == 0:
             self.is_clicked = False
-        
+
+    def set_resolution(self, resolution):
+        scale_x = float(float(resolution[0]) / 1920.0)
+        scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.x = self.x / self.scale_x * scale_x
+        self.y = self.y / self.scale_y * scale_y
+        self.width = self.width / self.scale_x * scale_x
+        self.height = self.height / self.scale_y * scale_y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+
+        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+
     def get_clicked(self):
         return self.is_clicked
     
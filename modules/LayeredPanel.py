@@ -0,0 +1,147 @@
+import pygame
+from modules.AssetManager import asset_manager
+
+class LayeredPanel:
+    def __init__(self, x : int, y : int, width : int, height : int, source : str, resolution = (1920, 1080), tile_size : int = 64, tolerance : int = 8) -> None:
+        self.scale_x = float(float(resolution[0]) / 1920.0)
+        self.scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.x = x * self.scale_x
+        self.y = y * self.scale_y
+        self.width = width * self.scale_x
+        self.height = height * self.scale_y
+        self.source = source
+
+        self.tile_size = tile_size
+        self.tolerance = tolerance
+
+        self.visible = True
+
+        self.base_image, self.base = self.acquire_base()
+        self.base_rect = self.base.get_rect()
+
+        self.patches = {}
+        self.variant_sources = {}
+        self.active = set()
+
+
+    def acquire_base(self) -> tuple:
+        image, offset = asset_manager.acquire_trimmed(self.source, (self.scale_x, self.scale_y), 'auto')
+        size = asset_manager.get_source_size(self.source, (self.scale_x, self.scale_y)) or image.get_size()
+        if offset == (0, 0) and size == image.get_size():
+            return image, image
+
+        base = pygame.Surface(size).convert()
+        base.fill((0, 0, 0))
+        base.blit(image, offset)
+        return image, base
+
+
+    def set_visible(self, value : bool) -> None:
+        self.visible = value
+
+
+    def set_variant(self, name : str, value : bool) -> None:
+        if value:
+            self.active.add(name)
+        else:
+            self.active.discard(name)
+
+
+    def get_patch_rects(self, variant : pygame.Surface) -> list:
+        tolerance = (self.tolerance, self.tolerance, self.tolerance, 255)
+        mask = pygame.mask.from_threshold(variant, (0,0,0,0), tolerance, self.base)
+        mask.invert()
+
+        tile = pygame.mask.Mask((self.tile_size, self.tile_size), fill=True)
+        rects = []
+        for y in range(0, self.base_rect.height, self.tile_size):
+            run = None
+            for x in range(0, self.base_rect.width, self.tile_size):
+                if mask.overlap_area(tile, (x, y)) > 0:
+                    if run is None:
+                        run = pygame.Rect(x, y, 0, self.tile_size)
+                    run.width = x + self.tile_size - run.x
+                elif run is not None:
+                    rects.append(run.clip(self.base_rect))
+                    run = None
+            if run is not None:
+                rects.append(run.clip(self.base_rect))
+        return rects
+
+
+    def add_variant(self, name : str, source : str) -> None:
+        try:
+            variant, offset = asset_manager.acquire_trimmed(source, (self.scale_x, self.scale_y), 'auto')
+        except:
+            print(f"Something went wrong while adding variant using '{source}'")
+            return None
+
+        layer = variant
+        if offset != (0, 0) or variant.get_size() != self.base_rect.size:
+            layer = self.base.copy()
+            layer.blit(variant, offset)
+
+        patches = []
+        for rect in self.get_patch_rects(layer):
+            patches.append((rect, layer.subsurface(rect).copy()))
+        asset_manager.release(variant)
+
+        self.patches[name] = patches
+        self.variant_sources[name] = source
+
+
+    def get_patch_bytes(self) -> int:
+        return sum(surface.get_pitch() * surface.get_height() for patches in self.patches.values() for _, surface in patches)
+
+
+    def release(self) -> None:
+        asset_manager.release(self.base_image)
+        self.patches = {}
+        self.active = set()
+
+
+    def set_resolution(self, resolution) -> None:
+        scale_x = float(float(resolution[0]) / 1920.0)
+        scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.x = self.x / self.scale_x * scale_x
+        self.y = self.y / self.scale_y * scale_y
+        self.width = self.width / self.scale_x * scale_x
+        self.height = self.height / self.scale_y * scale_y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+
+        active = self.active
+        base_image, base = self.acquire_base()
+        self.release()
+        self.base_image, self.base = base_image, base
+        self.base_rect = self.base.get_rect()
+
+        for name, source in self.variant_sources.items():
+            self.add_variant(name, source)
+        self.active = active
+
+
+    def compose(self, surface : pygame.Surface) -> None:
+        surface.blit(self.base, (0, 0))
+        for name, patches in self.patches.items():
+            if name in self.active:
+                for rect, patch in patches:
+                    surface.blit(patch, rect)
+
+
+    def draw(self, screen : pygame.Surface) -> None:
+        if not self.visible:
+            return None
+
+        view = self.base_rect.clip(pygame.Rect(-self.x, -self.y, screen.get_width(), screen.get_height()))
+        screen.blit(self.base, (self.x + view.x, self.y + view.y), view)
+
+        for name, patches in self.patches.items():
+            if name not in self.active:
+                continue
+            for rect, surface in patches:
+                area = rect.clip(view)
+                if area.width > 0 and area.height > 0:
+                    screen.blit(surface, (self.x + area.x, self.y + area.y), area.move(-rect.x, -rect.y))
@@ -1,7 +1,9 @@
 import pygame
+from modules.FontCache import font_cache
+from modules.SoundBank import sound_bank
 
 class MenuButton:
-    def __init__(self, x : int, y : int, font_name : str, font_size : int, text : str, sound = None, color = (255,255,255), resolution = (1920, 1080)) -> None:
+    def __init__(self, x : int, y : int, font_name : str, font_size : int, text : str, sound = None, color = (255,255,255), resolution = (1920, 1080), hover_x_offset : int = 0, sound_category : str = 'ui') -> None:
         self.scale_x = float(float(resolution[0]) / 1920.0)
         self.scale_y = float(float(resolution[1]) / 1080.0)
 
@@ -9,40 +11,72 @@ class MenuButton:
         self.y = y * self.scale_y
         
         self.font_name = font_name 
+        self.base_font_size = font_size
         self.font_size = int(font_size * self.scale_x)
         self.text = text
         self.sound = sound
+        self.sound_category = sound_category
        
         self.color = color
 
-        self.font = pygame.font.SysFont(self.font_name, self.font_size)
+        self.font = font_cache.get_font(self.font_name, self.font_size)
 
-        self.text_surface = self.font.render(self.text, True, self.color)
+        self.text_surface = font_cache.render(self.font, self.text, True, self.color)
 
         self.rect = pygame.Rect(self.x, self.y, self.text_surface.get_width(), self.text_surface.get_height())
 
-        self.clicked = False
         self.hovered = False
 
-    def get_clicked(self, mx, my, btn):
-        if self.rect.collidepoint(mx, my):
-            if pygame.mouse.get_pressed()[btn] and self.clicked == False:
-                self.clicked = True
-                return True
-        if pygame.mouse.get_pressed()[btn] == 0:
-            self.clicked = False
-            return False
-        
+        self.hover_x_offset = hover_x_offset
+        self.on_click = None
+        self.dirty = True
+
+    def set_resolution(self, resolution):
+        scale_x = float(float(resolution[0]) / 1920.0)
+        scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.x = self.x / self.scale_x * scale_x
+        self.y = self.y / self.scale_y * scale_y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+
+        self.font_size = int(self.base_font_size * self.scale_x)
+        self.font = font_cache.get_font(self.font_name, self.font_size)
+        self.text_surface = font_cache.render(self.font, self.text, True, self.color)
+
+        self.rect = pygame.Rect(self.x, self.y, self.text_surface.get_width(), self.text_surface.get_height())
+        self.dirty = True
+
+
+    def set_hovered(self, value : bool) -> None:
+        if value == self.hovered:
+            return None
+
+        if value and self.sound is not None:
+            sound_bank.play(self.sound, self.sound_category)
+        self.hovered = value
+        self.dirty = True
+
+
+    def on_enter(self, buttons) -> None:
+        self.set_hovered(True)
+
+
+    def on_leave(self) -> None:
+        self.set_hovered(False)
+
+
+    def on_press(self, btn) -> None:
+        if btn == 0 and self.on_click is not None:
+            self.on_click()
+
+
+    def get_dirty_rects(self):
+        return [pygame.Rect(self.x, self.y, self.rect.width + self.hover_x_offset, self.rect.height)]
 
-    def draw(self, screen, mx, my, hover_x_offset = 0):
-        if self.rect.collidepoint(mx, my) and self.hovered == False:
-            if self.sound is not None:
-                self.sound.play()
-            self.hovered = True
-        if not self.rect.collidepoint(mx, my):
-            self.hovered = False
 
+    def draw(self, screen):
         if self.hovered:
-            screen.blit(self.text_surface, (self.x + hover_x_offset, self.y))
+            screen.blit(self.text_surface, (self.x + self.hover_x_offset, self.y))
         else:
             screen.blit(self.text_surface, (self.x, self.y))
\ No newline at end of file
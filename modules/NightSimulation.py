@@ -0,0 +1,232 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class NightSimulation:
+    ROOMS = ['stage', 'dining_area', 'backstage', 'west_hall', 'east_hall', 'kitchen', 'vent_shaft', 'door', 'front_vent', 'right_vent']
+
+    DEFENSES = ['door', 'front_vent', 'right_vent']
+
+    ANIMATRONICS = [
+        {'name': 'freddy', 'start': 'stage', 'interval': 3.02, 'path': {
+            'stage': ['dining_area'], 'dining_area': ['east_hall'], 'east_hall': ['door', 'dining_area'], 'door': []}},
+        {'name': 'bonnie', 'start': 'stage', 'interval': 4.97, 'path': {
+            'stage': ['dining_area', 'backstage'], 'dining_area': ['backstage', 'west_hall'], 'backstage': ['dining_area', 'west_hall'],
+            'west_hall': ['door', 'backstage'], 'door': []}},
+        {'name': 'chica', 'start': 'stage', 'interval': 4.98, 'path': {
+            'stage': ['dining_area'], 'dining_area': ['kitchen', 'vent_shaft'], 'kitchen': ['dining_area', 'vent_shaft'],
+            'vent_shaft': ['front_vent', 'kitchen'], 'front_vent': []}},
+        {'name': 'foxy', 'start': 'backstage', 'interval': 5.01, 'path': {
+            'backstage': ['east_hall'], 'east_hall': ['right_vent', 'backstage'], 'right_vent': []}},
+    ]
+
+    NIGHT_PRESETS = {
+        1: {'freddy': 0, 'bonnie': 2, 'chica': 1, 'foxy': 0},
+        2: {'freddy': 1, 'bonnie': 4, 'chica': 3, 'foxy': 1},
+        3: {'freddy': 2, 'bonnie': 6, 'chica': 5, 'foxy': 3},
+        4: {'freddy': 4, 'bonnie': 8, 'chica': 7, 'foxy': 5},
+        5: {'freddy': 6, 'bonnie': 10, 'chica': 9, 'foxy': 8},
+    }
+
+    def __init__(self, levels = None, tick_rate : int = 144, nights : int = 1, hour_seconds : float = 60.0, hours : int = 6,
+                 animatronics : list = None, seed = None) -> None:
+        self.tick_rate = tick_rate
+        self.nights = nights
+        self.hour_ticks = int(round(hour_seconds * tick_rate))
+        self.end_tick = self.hour_ticks * hours
+
+        self.power_drain = 0.1 / tick_rate
+        self.defense_drain = numpy.full(len(self.DEFENSES), 0.25 / tick_rate) if numpy is not None else None
+        self.camera_drain = 0.1 / tick_rate
+
+        self.rng = numpy.random.default_rng(seed)
+
+        self.animatronics = animatronics or self.ANIMATRONICS
+        self.names = [animatronic['name'] for animatronic in self.animatronics]
+        self.room_index = {room: index for index, room in enumerate(self.ROOMS)}
+
+        self.init_graph()
+        self.set_levels(levels)
+        self.reset()
+
+
+    @staticmethod
+    def is_available() -> bool:
+        return numpy is not None
+
+
+    def init_graph(self) -> None:
+        count = len(self.animatronics)
+        rooms = len(self.ROOMS)
+        width = max(len(nexts) for animatronic in self.animatronics for nexts in animatronic['path'].values()) or 1
+
+        self.next_rooms = numpy.zeros((count, rooms, width), dtype=numpy.int16)
+        self.degrees = numpy.zeros((count, rooms), dtype=numpy.int16)
+        self.entry = numpy.full((count, rooms), -1, dtype=numpy.int16)
+
+        for a, animatronic in enumerate(self.animatronics):
+            for room, nexts in animatronic['path'].items():
+                r = self.room_index[room]
+                self.degrees[a, r] = len(nexts)
+                for i, next_room in enumerate(nexts):
+                    self.next_rooms[a, r, i] = self.room_index[next_room]
+                if room in self.DEFENSES:
+                    self.entry[a, r] = self.DEFENSES.index(room)
+
+        self.starts = numpy.array([self.room_index[animatronic['start']] for animatronic in self.animatronics], dtype=numpy.int16)
+        self.intervals = numpy.array([max(1, int(round(animatronic['interval'] * self.tick_rate))) for animatronic in self.animatronics])
+
+
+    def set_levels(self, levels) -> None:
+        if levels is None:
+            levels = self.NIGHT_PRESETS[1]
+
+        if isinstance(levels, dict):
+            row = [int(levels.get(name, 0)) for name in self.names]
+            self.levels = numpy.tile(numpy.array(row, dtype=numpy.int8), (self.nights, 1))
+        else:
+            self.levels = numpy.broadcast_to(numpy.asarray(levels, dtype=numpy.int8), (self.nights, len(self.names))).copy()
+
+        numpy.clip(self.levels, 0, 20, out=self.levels)
+
+
+    def reset(self) -> None:
+        self.tick_count = 0
+
+        self.positions = numpy.tile(self.starts, (self.nights, 1))
+        self.alive = numpy.ones(self.nights, dtype=bool)
+        self.living = self.nights
+        self.killed_by = numpy.full(self.nights, -1, dtype=numpy.int8)
+        self.death_tick = numpy.full(self.nights, -1, dtype=numpy.int32)
+        self.power = numpy.full(self.nights, 100.0)
+
+        self.closed = numpy.zeros((self.nights, len(self.DEFENSES)), dtype=bool)
+        self.camera = numpy.full(self.nights, -1, dtype=numpy.int16)
+        self.drain = numpy.full(self.nights, self.power_drain)
+        self.update_occupancy()
+
+        self.moves = numpy.zeros(len(self.names), dtype=numpy.int64)
+        self.blocked = numpy.zeros(len(self.names), dtype=numpy.int64)
+
+
+    def set_controls(self, closed = None, camera = None) -> None:
+        if closed is not None:
+            self.closed[...] = closed
+        if camera is not None:
+            if isinstance(camera, str):
+                camera = self.room_index[camera]
+            self.camera[...] = camera
+
+        looking = self.camera >= 0
+        self.drain = self.power_drain + (self.closed @ self.defense_drain) * ~looking + looking * self.camera_drain
+
+
+    def get_defenses(self):
+        return self.closed & (self.camera < 0)[:, None] & (self.power > 0)[:, None]
+
+
+    def update_occupancy(self) -> None:
+        entries = self.entry[numpy.arange(len(self.names)), self.positions]
+        self.occupancy = (entries[:, :, None] == numpy.arange(len(self.DEFENSES))).any(axis=1)
+
+
+    def get_entry_occupancy(self):
+        return self.occupancy
+
+
+    def check_power(self) -> None:
+        out = self.power <= 0
+        self.power[out] = 0.0
+        self.closed[out] = False
+        self.camera[out] = -1
+
+
+    def movement_opportunity(self, a : int) -> None:
+        self.check_power()
+
+        positions = self.positions[:, a]
+        rolls = self.rng.integers(1, 21, self.nights)
+        moving = self.alive & (rolls <= self.levels[:, a]) & (positions != self.camera)
+        if not moving.any():
+            return None
+
+        entry = self.entry[a, positions]
+        attacking = moving & (entry >= 0)
+        if attacking.any():
+            defenses = self.get_defenses()
+            held = numpy.zeros(self.nights, dtype=bool)
+            held[attacking] = defenses[attacking, entry[attacking]]
+
+            positions[held] = self.starts[a]
+            self.blocked[a] += int(held.sum())
+
+            killed = attacking & ~held
+            self.alive[killed] = False
+            self.killed_by[killed] = a
+            self.death_tick[killed] = self.tick_count
+            self.living -= int(killed.sum())
+
+        walking = moving & (entry < 0)
+        if walking.any():
+            current = positions[walking]
+            choice = (self.rng.random(len(current)) * self.degrees[a, current]).astype(numpy.int16)
+            positions[walking] = self.next_rooms[a, current, choice]
+            self.moves[a] += int(walking.sum())
+
+        self.update_occupancy()
+
+
+    def tick(self, ticks : int = 1) -> None:
+        for _ in range(ticks):
+            if self.is_finished():
+                return None
+
+            self.tick_count += 1
+            self.power -= self.drain
+
+            for a in numpy.flatnonzero(self.tick_count % self.intervals == 0):
+                self.movement_opportunity(a)
+
+
+    def run(self, policy = None) -> None:
+        while not self.is_finished():
+            if policy is not None:
+                policy(self)
+            self.tick()
+
+
+    def is_finished(self) -> bool:
+        return self.tick_count >= self.end_tick or self.living == 0
+
+
+    def get_power(self):
+        return numpy.maximum(self.power, 0.0)
+
+
+    def get_survived(self):
+        return self.alive & (self.tick_count >= self.end_tick)
+
+
+    def get_hour(self) -> int:
+        return min(self.tick_count // self.hour_ticks, self.end_tick // self.hour_ticks)
+
+
+    def get_rooms(self, night : int = 0) -> dict:
+        rooms = {}
+        for a, name in enumerate(self.names):
+            rooms.setdefault(self.ROOMS[self.positions[night, a]], []).append(name)
+        return rooms
+
+
+    def get_stats(self) -> dict:
+        dead = ~self.alive
+        return {
+            'nights': self.nights,
+            'survival_rate': float(self.get_survived().mean()),
+            'deaths': {name: int((self.killed_by == a).sum()) for a, name in enumerate(self.names)},
+            'mean_death_hour': float((self.death_tick[dead] / self.hour_ticks).mean()) if dead.any() else None,
+            'mean_power_left': float(self.get_power()[self.alive].mean()) if self.alive.any() else 0.0,
+            'moves': {name: int(self.moves[a]) for a, name in enumerate(self.names)},
+            'blocked': {name: int(self.blocked[a]) for a, name in enumerate(self.names)},
+        }
@@ -1,4 +1,5 @@
 import pygame
+from modules.AssetManager import asset_manager
 
 class Panel:
     def __init__(self, x : int, y : int, width : int, height : int, source : str = None, resolution = (1920, 1080)) -> None:
@@ -14,10 +15,15 @@ class Panel:
         self.visible = True
 
         self.images = []
+        self.offsets = []
+        self.image_sources = []
 
         if source is not None:
             try:
-                self.images.append(pygame.transform.scale_by(pygame.image.load(self.source).convert_alpha(), (self.scale_x, self.scale_y)))
+                image, offset = asset_manager.acquire_trimmed_handle(self.source, (self.scale_x, self.scale_y))
+                self.images.append(image)
+                self.offsets.append(offset)
+                self.image_sources.append((self.source, True))
             except:
                 print(f"Something went wrong while adding image using '{source}'")
 
@@ -30,17 +36,48 @@ class Panel:
 
     def add_image(self, source : str) -> None:
         try:
-            self.images.append(pygame.image.load(source))
+            image, offset = asset_manager.acquire_trimmed_handle(source)
+            self.images.append(image)
+            self.offsets.append(offset)
+            self.image_sources.append((source, False))
         except:
             print(f"Something went wrong while adding image using '{source}'")
 
 
+    def release(self) -> None:
+        for image in self.images:
+            asset_manager.release_handle(image)
+        self.images = []
+        self.offsets = []
+
+
+    def set_resolution(self, resolution) -> None:
+        scale_x = float(float(resolution[0]) / 1920.0)
+        scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.x = self.x / self.scale_x * scale_x
+        self.y = self.y / self.scale_y * scale_y
+        self.width = self.width / self.scale_x * scale_x
+        self.height = self.height / self.scale_y * scale_y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+
+        images = []
+        for source, scaled in self.image_sources:
+            images.append(asset_manager.acquire_trimmed_handle(source, (self.scale_x, self.scale_y) if scaled else (1.0, 1.0)))
+        self.release()
+        self.images = [image for image, _ in images]
+        self.offsets = [offset for _, offset in images]
+
+        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+
+
     def draw(self, screen:  pygame.surface, image_number : int = None) -> None:
         if self.visible:
             if self.source is not None:
-                if image_number is not None and image_number < len(self.images):
-                    screen.blit(self.images[image_number], (self.x, self.y))
-                else:
-                    screen.blit(self.images[0], (self.x, self.y))
+                if image_number is None or image_number >= len(self.images):
+                    image_number = 0
+                offset_x, offset_y = self.offsets[image_number]
+                screen.blit(asset_manager.get_surface(self.images[image_number]), (self.x + offset_x, self.y + offset_y))
             else:
                 pygame.draw.rect(screen, (0,0,0), self.rect)
\ No newline at end of file
@@ -0,0 +1,166 @@
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class PanoramaView:
+    def __init__(self, resolution = (1920, 1080), strength : float = 0.15, quality : float = 1.0, motion_quality : float = None) -> None:
+        self.strength = strength
+        self.quality = quality
+        self.motion_quality = motion_quality
+
+        self.key = None
+        self.source_key = None
+        self.scaled = False
+        self.warps = 0
+        self.set_resolution(resolution)
+
+
+    @staticmethod
+    def is_available() -> bool:
+        return numpy is not None
+
+
+    def set_resolution(self, resolution) -> None:
+        self.size = (int(resolution[0]), int(resolution[1]))
+
+        self.source = pygame.Surface(self.size, 0, 32)
+        self.output = pygame.Surface(self.size, 0, 32)
+        self.still = self.create_level(self.quality)
+        if self.motion_quality is not None and self.motion_quality < self.quality:
+            self.motion = self.create_level(self.motion_quality)
+        else:
+            self.motion = self.still
+        self.level = self.still
+
+        self.build_lut()
+        self.key = None
+        self.source_key = None
+
+
+    def set_quality(self, quality : float, motion_quality : float = None) -> None:
+        self.quality = quality
+        self.motion_quality = motion_quality
+        self.set_resolution(self.size)
+
+
+    def create_level(self, quality : float) -> dict:
+        size = (max(1, int(self.size[0] * quality)), max(1, int(self.size[1] * quality)))
+
+        steps = []
+        step = (size[0] * 2, size[1] * 2)
+        while step[0] < self.size[0] and step[1] < self.size[1]:
+            steps.append(pygame.Surface(step, 0, 32))
+            step = (step[0] * 2, step[1] * 2)
+
+        return {'size': size, 'surface': self.output if size == self.size else pygame.Surface(size, 0, 32), 'steps': steps, 'lut': None}
+
+
+    def is_settled(self) -> bool:
+        return self.level is self.still
+
+
+    def build_lut(self) -> None:
+        for level in (self.still, self.motion):
+            level['lut'] = self.get_lut(level['size'])
+
+
+    def get_lut(self, warp_size):
+        width, height = self.size
+        warp_width, warp_height = warp_size
+
+        columns = (numpy.arange(warp_width) + 0.5) * (width / warp_width)
+        rows = (numpy.arange(warp_height) + 0.5) * (height / warp_height)
+
+        zoom = self.get_zoom(columns)
+
+        center = height * 0.5
+        source_rows = center + (rows[:, None] - center) / zoom[None, :]
+        source_rows = numpy.clip(source_rows.astype(numpy.intp), 0, height - 1)
+        source_columns = numpy.clip(columns.astype(numpy.intp), 0, width - 1)
+
+        pitch = self.source.get_pitch() // 4
+        return source_rows * pitch + source_columns[None, :]
+
+
+    def get_zoom(self, x):
+        offset = (x - self.size[0] * 0.5) / (self.size[0] * 0.5)
+        return 1.0 + self.strength * offset * offset
+
+
+    def unwarp(self, x : int, y : int) -> tuple:
+        center = self.size[1] * 0.5
+        return x, center + (y - center) / self.get_zoom(x)
+
+
+    def compose(self, panel) -> None:
+        key = (id(panel.base), frozenset(panel.active))
+        if key == self.source_key:
+            return None
+
+        width, height = panel.base_rect.size
+        size = (max(width, self.size[0]), max(height, self.size[1]))
+        if self.source.get_size() != size:
+            self.source = pygame.Surface(size, 0, 32)
+            self.build_lut()
+        self.source.fill((0, 0, 0))
+        panel.compose(self.source)
+        self.source_key = key
+
+
+    def warp(self, level : dict, x : int = 0, y : int = 0) -> None:
+        x = min(max(0, int(x)), self.source.get_width() - self.size[0])
+        y = min(max(0, int(y)), self.source.get_height() - self.size[1])
+
+        buffer = self.source.get_buffer()
+        source = numpy.frombuffer(buffer, numpy.uint32)[y * (self.source.get_pitch() // 4) + x:]
+        target = pygame.surfarray.pixels2d(level['surface'])
+
+        if target.T.flags['C_CONTIGUOUS']:
+            numpy.take(source, level['lut'], out=target.T, mode='wrap')
+        else:
+            target.T[...] = numpy.take(source, level['lut'], mode='wrap')
+        del source, target, buffer
+        self.warps += 1
+
+
+    def render(self, screen : pygame.Surface, panel, level : dict) -> None:
+        self.warp(level, -panel.x, -panel.y)
+        self.level = level
+        self.scaled = level['surface'] is self.output
+
+        if not self.scaled and screen.get_size() == self.size:
+            self.scale(level, screen)
+            return None
+        self.blit(screen)
+
+
+    def scale(self, level : dict, target : pygame.Surface) -> None:
+        surface = level['surface']
+        for step in level['steps']:
+            pygame.transform.scale(surface, step.get_size(), step)
+            surface = step
+        pygame.transform.scale(surface, self.size, target)
+
+
+    def blit(self, screen : pygame.Surface) -> None:
+        if not self.scaled:
+            self.scale(self.level, self.output)
+            self.scaled = True
+        screen.blit(self.output, (0, 0))
+
+
+    def draw(self, screen : pygame.Surface, panel, key = None) -> None:
+        if not panel.visible:
+            return None
+
+        if key is None or key != self.key:
+            self.compose(panel)
+            self.key = key
+            self.render(screen, panel, self.motion)
+        elif self.level is not self.still:
+            self.render(screen, panel, self.still)
+        else:
+            self.blit(screen)
@@ -0,0 +1,118 @@
+import pygame
+import json
+import time
+from collections import deque
+from modules.FontCache import font_cache
+
+class Profiler:
+    def __init__(self, window : int = 600, trace_limit : int = 200000) -> None:
+        self.window = window
+        self.trace_limit = trace_limit
+
+        self.samples = {}
+        self.trace = []
+        self.wrapped = []
+        self.origin = time.perf_counter()
+
+        self.font = font_cache.get_font('Arial', 18)
+        self.lines = []
+        self.last_overlay_update = 0
+        self.overlay_rect = pygame.Rect(0, 0, 0, 0)
+
+
+    def wrap(self, obj, name : str, phase : str) -> None:
+        original = getattr(obj, name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.record(phase, start, time.perf_counter())
+
+        setattr(obj, name, timed)
+        self.wrapped.append((obj, name))
+
+
+    def unwrap_all(self) -> None:
+        for obj, name in reversed(self.wrapped):
+            if name in vars(obj):
+                delattr(obj, name)
+        self.wrapped = []
+
+
+    def record(self, phase : str, start : float, end : float) -> None:
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+        samples.append((end - start) * 1000.0)
+
+        if len(self.trace) < self.trace_limit:
+            self.trace.append({
+                'name': phase,
+                'ph': 'X',
+                'ts': (start - self.origin) * 1000000.0,
+                'dur': (end - start) * 1000000.0,
+                'pid': 0,
+                'tid': 0,
+            })
+
+
+    def get_stats(self, phase : str) -> dict:
+        samples = sorted(self.samples.get(phase, ()))
+        if not samples:
+            return {'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+
+        return {
+            'mean': sum(samples) / len(samples),
+            'p50': samples[int(0.50 * (len(samples) - 1))],
+            'p99': samples[int(0.99 * (len(samples) - 1))],
+            'max': samples[-1],
+        }
+
+
+    def get_histogram(self, phase : str, bucket_ms : float = 0.5) -> dict:
+        histogram = {}
+        for sample in self.samples.get(phase, ()):
+            bucket = int(sample / bucket_ms) * bucket_ms
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+        return dict(sorted(histogram.items()))
+
+
+    def dump_trace(self, path : str) -> None:
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.trace, 'displayTimeUnit': 'ms'}, f)
+
+
+    def update_overlay(self, fps : float) -> None:
+        frame = self.get_stats('frame')
+        lines = [f"FPS {fps:.0f}   frame p50 {frame['p50']:.2f} ms   p99 {frame['p99']:.2f} ms"]
+        for phase in self.samples:
+            if phase != 'frame':
+                lines.append(f"{phase}: {self.get_stats(phase)['mean']:.3f} ms")
+
+        fonts = font_cache.get_stats()
+        lines.append(f"font cache {fonts['font_hit_rate'] * 100:.0f}%   text cache {fonts['text_hit_rate'] * 100:.0f}%")
+
+        self.lines = [self.font.render(line, True, (255,255,0)) for line in lines]
+
+
+    def draw_overlay(self, screen : pygame.Surface, fps : float) -> pygame.Rect:
+        now = pygame.time.get_ticks()
+        if now - self.last_overlay_update > 250:
+            self.update_overlay(fps)
+            self.last_overlay_update = now
+
+        width = max((line.get_width() for line in self.lines), default=0) + 16
+        height = sum(line.get_height() for line in self.lines) + 16
+        dirty = self.overlay_rect.union(pygame.Rect(0, 0, width, height))
+        self.overlay_rect = pygame.Rect(0, 0, width, height)
+
+        screen.set_clip(None)
+        screen.fill((0,0,0), dirty)
+        y = 8
+        for line in self.lines:
+            screen.blit(line, (8, y))
+            y += line.get_height()
+
+        return dirty
@@ -0,0 +1,77 @@
+import pygame
+
+class Renderer:
+    def __init__(self, screen : pygame.Surface, history_size : int = 144) -> None:
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+
+        self.dirty_rects = []
+        self.full_redraw = True
+
+        self.history_size = history_size
+        self.dirty_area_history = []
+        self.last_dirty_area = 0
+
+
+    def mark_all(self) -> None:
+        self.full_redraw = True
+
+
+    def mark_dirty(self, rect : pygame.Rect) -> None:
+        if self.full_redraw:
+            return None
+
+        rect = self.screen_rect.clip(rect)
+        if rect.width > 0 and rect.height > 0:
+            self.dirty_rects.append(rect)
+
+
+    def collect(self, *widgets) -> None:
+        for widget in widgets:
+            if widget.dirty:
+                for rect in widget.get_dirty_rects():
+                    self.mark_dirty(rect)
+                widget.dirty = False
+
+
+    def has_dirty(self) -> bool:
+        return self.full_redraw or len(self.dirty_rects) > 0
+
+
+    def begin(self) -> None:
+        if self.full_redraw:
+            self.screen.set_clip(None)
+        elif self.dirty_rects:
+            self.screen.set_clip(self.dirty_rects[0].unionall(self.dirty_rects[1:]))
+
+
+    def present(self) -> None:
+        if self.full_redraw:
+            area = self.screen_rect.width * self.screen_rect.height
+            pygame.display.update()
+        elif self.dirty_rects:
+            area = sum(rect.width * rect.height for rect in self.dirty_rects)
+            pygame.display.update(self.dirty_rects)
+        else:
+            area = 0
+
+        self.screen.set_clip(None)
+        self.dirty_rects = []
+        self.full_redraw = False
+
+        self.last_dirty_area = area
+        self.dirty_area_history.append(area)
+        if len(self.dirty_area_history) > self.history_size:
+            del self.dirty_area_history[0]
+
+
+    def get_stats(self) -> dict:
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        average = sum(self.dirty_area_history) / len(self.dirty_area_history) if self.dirty_area_history else 0
+        return {
+            'last_dirty_area': self.last_dirty_area,
+            'average_dirty_area': average,
+            'average_dirty_fraction': average / screen_area,
+            'idle_frames': self.dirty_area_history.count(0),
+            'frames': len(self.dirty_area_history),
+        }
@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import copy
+import threading
+
+class SaveManager:
+    def __init__(self, coalesce_delay : float = 0.2) -> None:
+        self.coalesce_delay = coalesce_delay
+
+        self.pending = {}
+        self.condition = threading.Condition()
+        self.writing = False
+
+        self.requests = 0
+        self.writes = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.write_time = 0.0
+
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+
+
+    def validate(self, data, default):
+        if isinstance(default, dict):
+            if not isinstance(data, dict):
+                return copy.deepcopy(default)
+            if not default:
+                return {key: value for key, value in data.items() if isinstance(key, str) and isinstance(value, (int, float)) and not isinstance(value, bool)}
+            return {key: self.validate(data.get(key), value) for key, value in default.items()}
+
+        if isinstance(default, list):
+            if not isinstance(data, list) or len(data) != len(default):
+                return copy.deepcopy(default)
+            return [self.validate(item, value) for item, value in zip(data, default)]
+
+        if isinstance(default, bool):
+            return data if isinstance(data, bool) else default
+
+        if isinstance(default, (int, float)):
+            if isinstance(data, bool) or not isinstance(data, (int, float)):
+                return default
+            return type(default)(data)
+
+        return data if isinstance(data, type(default)) else default
+
+
+    def load(self, path : str, defaults : dict, fallback_path : str = None) -> dict:
+        for source in (path, fallback_path):
+            if source is None or not os.path.exists(source):
+                continue
+            try:
+                with open(source, "r") as f:
+                    return self.validate(json.load(f), defaults)
+            except Exception as e:
+                print(f"Something went wrong while loading '{source}': {e}")
+
+        return copy.deepcopy(defaults)
+
+
+    def save(self, path : str, data : dict) -> None:
+        text = json.dumps(data)
+
+        with self.condition:
+            self.requests += 1
+            if path in self.pending:
+                self.coalesced += 1
+            self.pending[path] = text
+            self.condition.notify_all()
+
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+
+            time.sleep(self.coalesce_delay)
+
+            with self.condition:
+                pending = self.pending
+                self.pending = {}
+                self.writing = True
+
+            for path, text in pending.items():
+                self.write_atomic(path, text)
+
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+
+    def write_atomic(self, path : str, text : str) -> None:
+        start = time.perf_counter()
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+            self.writes += 1
+        except Exception as e:
+            self.failures += 1
+            print(f"Something went wrong while saving '{path}': {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.write_time += time.perf_counter() - start
+
+
+    def flush(self, timeout : float = 5.0) -> bool:
+        deadline = time.perf_counter() + timeout
+        with self.condition:
+            while self.pending or self.writing:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+
+    def get_stats(self) -> dict:
+        return {
+            'requests': self.requests,
+            'writes': self.writes,
+            'coalesced': self.coalesced,
+            'failures': self.failures,
+            'write_ms': self.write_time * 1000.0,
+        }
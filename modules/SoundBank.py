@@ -0,0 +1,153 @@
+import pygame
+
+class SoundBank:
+    def __init__(self) -> None:
+        self.sounds = {}
+        self.categories = {}
+        self.reserved = 0
+
+        self.volume = 1.0
+        self.music_source = None
+        self.music_volume = 1.0
+
+        self.plays = 0
+        self.dropped = 0
+        self.stolen = 0
+
+
+    def is_available(self) -> bool:
+        return pygame.mixer.get_init() is not None
+
+
+    def add_category(self, name : str, voices : int, cooldown : int = 0, volume : float = 1.0) -> None:
+        if name in self.categories or not self.is_available():
+            return None
+
+        first = self.reserved
+        self.reserved += voices
+        if pygame.mixer.get_num_channels() < self.reserved:
+            pygame.mixer.set_num_channels(self.reserved)
+        pygame.mixer.set_reserved(self.reserved)
+
+        self.categories[name] = {
+            'channels': [pygame.mixer.Channel(index) for index in range(first, self.reserved)],
+            'started': [0] * voices,
+            'cooldown': cooldown,
+            'volume': volume,
+            'last_play': None,
+        }
+
+
+    def load(self, source : str) -> pygame.mixer.Sound:
+        sound = self.sounds.get(source)
+        if sound is None and self.is_available():
+            try:
+                sound = pygame.mixer.Sound(source)
+                sound.set_volume(self.volume)
+                self.sounds[source] = sound
+            except:
+                print(f"Something went wrong while loading sound '{source}'")
+        return sound
+
+
+    def play(self, source : str, category : str, loops : int = 0) -> pygame.mixer.Channel:
+        sound = self.load(source)
+        group = self.categories.get(category)
+        if sound is None or group is None:
+            return None
+
+        now = pygame.time.get_ticks()
+        if group['last_play'] is not None and now - group['last_play'] < group['cooldown']:
+            self.dropped += 1
+            return None
+
+        index = None
+        for i, channel in enumerate(group['channels']):
+            if not channel.get_busy():
+                index = i
+                break
+        if index is None:
+            index = group['started'].index(min(group['started']))
+            self.stolen += 1
+
+        channel = group['channels'][index]
+        channel.play(sound, loops)
+        channel.set_volume(group['volume'])
+
+        group['started'][index] = now
+        group['last_play'] = now
+        self.plays += 1
+        return channel
+
+
+    def stop(self, category : str) -> None:
+        group = self.categories.get(category)
+        if group is not None:
+            for channel in group['channels']:
+                channel.stop()
+
+
+    def set_category_volume(self, category : str, volume : float) -> None:
+        group = self.categories[category]
+        group['volume'] = volume
+        for channel in group['channels']:
+            channel.set_volume(volume)
+
+
+    def play_music(self, source : str, loops : int = -1, fade_ms : int = 0, volume : float = 1.0) -> None:
+        if not self.is_available():
+            return None
+
+        self.music_volume = volume
+        if source == self.music_source and pygame.mixer.music.get_busy():
+            pygame.mixer.music.set_volume(self.music_volume * self.volume)
+            return None
+
+        try:
+            pygame.mixer.music.load(source)
+            pygame.mixer.music.set_volume(self.music_volume * self.volume)
+            pygame.mixer.music.play(loops, fade_ms=fade_ms)
+            self.music_source = source
+        except:
+            print(f"Something went wrong while streaming '{source}'")
+
+
+    def stop_music(self, fade_ms : int = 0) -> None:
+        if not self.is_available() or self.music_source is None:
+            return None
+
+        if fade_ms > 0:
+            pygame.mixer.music.fadeout(fade_ms)
+        else:
+            pygame.mixer.music.stop()
+        self.music_source = None
+
+
+    def set_volume(self, volume : float) -> None:
+        self.volume = volume
+        for sound in self.sounds.values():
+            sound.set_volume(volume)
+        if self.music_source is not None:
+            pygame.mixer.music.set_volume(self.music_volume * volume)
+
+
+    def get_sound_bytes(self) -> int:
+        if not self.is_available():
+            return 0
+
+        frequency, size, channels = pygame.mixer.get_init()
+        return int(sum(sound.get_length() for sound in self.sounds.values()) * frequency * channels * (abs(size) // 8))
+
+
+    def get_stats(self) -> dict:
+        return {
+            'sounds': len(self.sounds),
+            'bytes': self.get_sound_bytes(),
+            'reserved_channels': self.reserved,
+            'plays': self.plays,
+            'dropped': self.dropped,
+            'stolen': self.stolen,
+        }
+
+
+sound_bank = SoundBank()
@@ -0,0 +1,55 @@
+import json
+import time
+import platform
+
+class StartupTimeline:
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.marks = []
+
+
+    def mark(self, name : str) -> None:
+        self.marks.append((name, (time.perf_counter() - self.origin) * 1000.0))
+
+
+    def get(self, name : str) -> float:
+        for mark, ms in self.marks:
+            if mark == name:
+                return ms
+        return None
+
+
+    def get_report(self, base_path : str = None) -> dict:
+        import pygame
+
+        phases = {}
+        previous = 0.0
+        for name, ms in self.marks:
+            phases[name] = {'at_ms': ms, 'phase_ms': ms - previous}
+            previous = ms
+
+        return {
+            'phases': phases,
+            'total_ms': previous,
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'meipass': getattr(sys, '_MEIPASS', None),
+            'base_path': base_path,
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+        }
+
+
+    def dump(self, path : str, base_path : str = None) -> None:
+        with open(path, "w") as f:
+            json.dump(self.get_report(base_path), f, indent=2)
+
+
+    def print_report(self) -> None:
+        previous = 0.0
+        for name, ms in self.marks:
+            print(f"{name:16} {ms:9.2f} ms  (+{ms - previous:.2f} ms)")
+            previous = ms
+
+
+startup_timeline = StartupTimeline()
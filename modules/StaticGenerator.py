@@ -0,0 +1,198 @@
+import pygame
+import queue
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class StaticGenerator:
+    def __init__(self, x : int, y : int, width : int, height : int, resolution = (1920, 1080), frame_delay : int = 100,
+                 intensity : float = 1.0, scanlines : float = 0.0, roll : float = 0.0, alpha : int = 13, cell = (8, 4)) -> None:
+        self.scale_x = float(float(resolution[0]) / 1920.0)
+        self.scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.x = x * self.scale_x
+        self.y = y * self.scale_y
+        self.width = width * self.scale_x
+        self.height = height * self.scale_y
+        self.frame_delay = frame_delay
+
+        self.intensity = intensity
+        self.scanlines = scanlines
+        self.roll = roll
+        self.alpha = alpha
+        self.cell = cell
+
+        self.background = None
+        self.roll_position = 0.0
+
+        self.frame = 0
+        self.surface = None
+        self.last_tick = pygame.time.get_ticks()
+
+        self.frames = queue.Queue(maxsize=1)
+        self.thread = None
+        self.stopping = threading.Event()
+        self.active = threading.Event()
+
+        self.dirty = True
+
+        self.init_buffers()
+
+
+    @staticmethod
+    def is_available() -> bool:
+        return numpy is not None
+
+
+    def init_buffers(self) -> None:
+        self.size = (int(self.width), int(self.height))
+        self.noise_size = (max(1, self.size[0] // self.cell[0]), max(1, self.size[1] // self.cell[1]))
+        self.noise = pygame.Surface(self.noise_size, pygame.SRCALPHA)
+        self.rng = numpy.random.default_rng()
+
+        rows = numpy.arange(self.noise_size[1], dtype=numpy.float32)
+        self.scanline_mask = numpy.where(rows % 2 == 1, 1.0 - self.scanlines, 1.0).astype(numpy.float32)
+        self.rows = rows
+
+        self.surface = self.generate()
+
+
+    def set_background(self, background : pygame.Surface) -> None:
+        self.stop()
+        self.background = background
+        self.surface = self.generate()
+        self.dirty = True
+
+
+    def generate(self) -> pygame.Surface:
+        values = self.rng.random(self.noise_size, dtype=numpy.float32)
+        values *= values
+        values *= 255.0 * self.intensity
+
+        if self.scanlines > 0:
+            values *= self.scanline_mask
+
+        if self.roll > 0:
+            self.roll_position = (self.roll_position + self.roll * self.noise_size[1] * 0.05) % self.noise_size[1]
+            band = numpy.exp(-((self.rows - self.roll_position) / (self.noise_size[1] * 0.04)) ** 2)
+            values += band * (96.0 * self.roll)
+
+        grey = numpy.clip(values, 0, 255).astype(numpy.uint8)
+
+        pixels = pygame.surfarray.pixels3d(self.noise)
+        pixels[...] = grey[:, :, None]
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(self.noise)
+        alpha[...] = self.alpha
+        del alpha
+
+        overlay = pygame.transform.scale(self.noise, self.size)
+        if self.background is None:
+            return overlay
+
+        frame = self.background.copy()
+        frame.blit(overlay, (0, 0))
+        return frame
+
+
+    def run(self) -> None:
+        while not self.stopping.is_set():
+            if not self.active.wait(0.05):
+                continue
+            frame = self.generate()
+            while not self.stopping.is_set():
+                try:
+                    self.frames.put(frame, timeout=0.05)
+                    break
+                except queue.Full:
+                    pass
+
+
+    def start(self) -> None:
+        if self.active.is_set():
+            return None
+
+        self.last_tick = pygame.time.get_ticks()
+        self.active.set()
+        if self.thread is not None:
+            return None
+
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+
+    def pause(self) -> None:
+        self.active.clear()
+
+
+    def stop(self) -> None:
+        self.active.clear()
+        if self.thread is None:
+            return None
+
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+
+        while not self.frames.empty():
+            self.frames.get_nowait()
+
+
+    def release(self) -> None:
+        self.stop()
+        self.background = None
+
+
+    def set_resolution(self, resolution) -> None:
+        scale_x = float(float(resolution[0]) / 1920.0)
+        scale_y = float(float(resolution[1]) / 1080.0)
+
+        running = self.active.is_set()
+        self.stop()
+
+        self.x = self.x / self.scale_x * scale_x
+        self.y = self.y / self.scale_y * scale_y
+        self.width = self.width / self.scale_x * scale_x
+        self.height = self.height / self.scale_y * scale_y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+
+        self.background = None
+        self.init_buffers()
+        self.dirty = True
+
+        if running:
+            self.start()
+
+
+    def get_dirty_rects(self) -> list:
+        return [pygame.Rect((self.x, self.y), self.size)]
+
+
+    def get_time_to_next_frame(self) -> int:
+        return max(0, self.last_tick + self.frame_delay + 1 - pygame.time.get_ticks())
+
+
+    def update_loop(self) -> None:
+        self.start()
+
+        current_tick = pygame.time.get_ticks()
+        if current_tick - self.last_tick <= self.frame_delay:
+            return None
+
+        try:
+            self.surface = self.frames.get_nowait()
+        except queue.Empty:
+            return None
+
+        self.last_tick += (current_tick - self.last_tick) // self.frame_delay * self.frame_delay
+        self.frame += 1
+        self.dirty = True
+
+
+    def draw(self, screen : pygame.Surface) -> None:
+        screen.blit(self.surface, (self.x, self.y))
@@ -0,0 +1,270 @@
+import pygame
+import time
+import zlib
+import queue
+import threading
+from collections import OrderedDict
+
+class SurfaceStore:
+    def __init__(self, budget : int = 64 * 1048576, compress_level : int = 1) -> None:
+        self.budget = budget
+        self.compress_level = compress_level
+
+        self.entries = {}
+        self.hot = OrderedDict()
+        self.pins = {}
+        self.next_handle = 1
+
+        self.hot_bytes = 0
+        self.cold_bytes = 0
+        self.pinned_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.compress_time = 0.0
+        self.inflate_time = 0.0
+        self.decompress_time = 0.0
+
+        self.lock = threading.Lock()
+        self.pending = queue.Queue()
+        self.worker = None
+
+
+    def set_budget(self, budget : int) -> None:
+        self.budget = budget
+        self.trim()
+
+
+    def get_surface_bytes(self, surface : pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+
+    def put(self, surface : pygame.Surface) -> int:
+        handle = self.next_handle
+        self.next_handle += 1
+
+        self.entries[handle] = {
+            'surface': surface,
+            'data': None,
+            'compressed': False,
+            'size': surface.get_size(),
+            'format': 'RGBA' if surface.get_flags() & pygame.SRCALPHA else 'RGB',
+            'alpha': surface.get_alpha(),
+            'colorkey': surface.get_colorkey(),
+            'bytes': self.get_surface_bytes(surface),
+        }
+        self.hot[handle] = True
+        self.hot_bytes += self.entries[handle]['bytes']
+
+        self.trim(handle)
+        return handle
+
+
+    def get(self, handle : int) -> pygame.Surface:
+        entry = self.entries[handle]
+
+        if entry['surface'] is not None:
+            self.hits += 1
+            self.hot.move_to_end(handle)
+            return entry['surface']
+
+        self.misses += 1
+        self.decompress(handle)
+        self.trim(handle)
+        return entry['surface']
+
+
+    def get_ready(self, handle : int) -> pygame.Surface:
+        entry = self.entries[handle]
+        if entry['surface'] is None:
+            with self.lock:
+                ready = entry['data'] is not None and not entry['compressed']
+            if not ready:
+                return None
+        return self.get(handle)
+
+
+    def get_size(self, handle : int) -> tuple:
+        return self.entries[handle]['size']
+
+
+    def is_hot(self, handle : int) -> bool:
+        return self.entries[handle]['surface'] is not None
+
+
+    def pin(self, handle : int) -> None:
+        count = self.pins.get(handle, 0)
+        self.pins[handle] = count + 1
+        if count:
+            return None
+
+        entry = self.entries[handle]
+        self.pinned_bytes += entry['bytes']
+        if entry['surface'] is None:
+            self.warm([handle])
+
+
+    def unpin(self, handle : int) -> None:
+        count = self.pins.get(handle, 0)
+        if count > 1:
+            self.pins[handle] = count - 1
+        elif count == 1:
+            del self.pins[handle]
+            self.pinned_bytes -= self.entries[handle]['bytes']
+            self.trim()
+
+
+    def is_pinned(self, handle : int) -> bool:
+        return handle in self.pins
+
+
+    def warm(self, handles : list) -> None:
+        for handle in handles:
+            entry = self.entries.get(handle)
+            if entry is not None and entry['surface'] is None:
+                self.submit(entry, None)
+
+
+    def remove(self, handle : int) -> None:
+        entry = self.entries.pop(handle, None)
+        if entry is None:
+            return None
+
+        if self.pins.pop(handle, None) is not None:
+            self.pinned_bytes -= entry['bytes']
+
+        if entry['surface'] is not None:
+            del self.hot[handle]
+            self.hot_bytes -= entry['bytes']
+        else:
+            with self.lock:
+                self.cold_bytes -= len(entry['data'])
+                entry['data'] = None
+
+
+    def evict(self, handle : int) -> None:
+        entry = self.entries[handle]
+
+        data = pygame.image.tobytes(entry['surface'], entry['format'])
+        with self.lock:
+            entry['data'] = data
+            entry['compressed'] = False
+            self.cold_bytes += len(data)
+
+        entry['surface'] = None
+        del self.hot[handle]
+        self.hot_bytes -= entry['bytes']
+        self.evictions += 1
+
+        self.submit(entry, data)
+
+
+    def submit(self, entry : dict, data : bytes) -> None:
+        self.pending.put((entry, data))
+        if self.worker is None:
+            self.worker = threading.Thread(target=self.process_pending, daemon=True)
+            self.worker.start()
+
+
+    def process_pending(self) -> None:
+        while True:
+            entry, data = self.pending.get()
+            if data is None:
+                self.inflate(entry)
+            else:
+                self.compress(entry, data)
+            self.pending.task_done()
+
+
+    def flush(self) -> None:
+        if self.worker is not None:
+            self.pending.join()
+
+
+    def inflate(self, entry : dict) -> None:
+        with self.lock:
+            data = entry['data']
+            if data is None or not entry['compressed']:
+                return None
+
+        start = time.perf_counter()
+        inflated = zlib.decompress(data)
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            self.inflate_time += elapsed
+            if entry['data'] is data:
+                entry['data'] = inflated
+                entry['compressed'] = False
+                self.cold_bytes += len(inflated) - len(data)
+
+
+    def compress(self, entry : dict, data : bytes) -> None:
+        start = time.perf_counter()
+        compressed = zlib.compress(data, self.compress_level)
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            self.compress_time += elapsed
+            if entry['data'] is data:
+                entry['data'] = compressed
+                entry['compressed'] = True
+                self.cold_bytes += len(compressed) - len(data)
+
+
+    def decompress(self, handle : int) -> None:
+        entry = self.entries[handle]
+
+        start = time.perf_counter()
+        with self.lock:
+            data = entry['data']
+            compressed = entry['compressed']
+            entry['data'] = None
+            self.cold_bytes -= len(data)
+
+        if compressed:
+            data = zlib.decompress(data)
+        surface = pygame.image.frombuffer(data, entry['size'], entry['format'])
+        if entry['format'] == 'RGBA':
+            surface = surface.convert_alpha()
+        else:
+            surface = surface.convert()
+            if entry['colorkey'] is not None:
+                surface.set_colorkey(entry['colorkey'], pygame.RLEACCEL)
+            if entry['alpha'] is not None and entry['alpha'] < 255:
+                surface.set_alpha(entry['alpha'], pygame.RLEACCEL)
+        self.decompress_time += time.perf_counter() - start
+
+        entry['surface'] = surface
+        self.hot[handle] = True
+        self.hot_bytes += entry['bytes']
+
+
+    def trim(self, keep : int = None) -> None:
+        for handle in list(self.hot):
+            if self.hot_bytes <= self.budget:
+                break
+            if handle != keep and handle not in self.pins:
+                self.evict(handle)
+
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hot_bytes': self.hot_bytes,
+            'cold_bytes': self.cold_bytes,
+            'pinned_bytes': self.pinned_bytes,
+            'pinned': len(self.pins),
+            'budget': self.budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'compress_ms': self.compress_time * 1000.0,
+            'inflate_ms': self.inflate_time * 1000.0,
+            'decompress_ms': self.decompress_time * 1000.0,
+        }
+
+
+surface_store = SurfaceStore()
@@ -1,4 +1,5 @@
 import pygame
+from modules.FontCache import font_cache
 
 class Text:
     def __init__(self, x : int, y : int, font_name : str, font_size : int, text : str, color = (255, 255, 255), resolution = (1920, 1080)) -> None:
@@ -7,19 +8,55 @@ class Text:
         self.x = x * self.scale_x
         self.y = y * self.scale_y
         self.font_name = font_name
+        self.base_font_size = font_size
         self.font_size = int(font_size * self.scale_x)
 
-        self.font = pygame.font.SysFont(self.font_name, self.font_size)
+        self.font = font_cache.get_font(self.font_name, self.font_size)
 
         self.text = text
         self.color = color
 
-        self.text_surface = self.font.render(self.text, True, self.color)
+        self.text_surface = font_cache.render(self.font, self.text, True, self.color)
+
+        self.dirty = True
+        self.dirty_rects = []
+
+
+    def get_rect(self):
+        return pygame.Rect(self.x, self.y, self.text_surface.get_width(), self.text_surface.get_height())
+
+
+    def get_dirty_rects(self):
+        rects = self.dirty_rects + [self.get_rect()]
+        self.dirty_rects = []
+        return rects
+
+
+    def set_resolution(self, resolution):
+        scale_x = float(float(resolution[0]) / 1920.0)
+        scale_y = float(float(resolution[1]) / 1080.0)
+
+        self.x = self.x / self.scale_x * scale_x
+        self.y = self.y / self.scale_y * scale_y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+
+        self.font_size = int(self.base_font_size * self.scale_x)
+        self.font = font_cache.get_font(self.font_name, self.font_size)
+        self.text_surface = font_cache.render(self.font, self.text, True, self.color)
+
+        self.dirty_rects = []
+        self.dirty = True
 
 
     def change_text(self, text):
+        if text == self.text:
+            return None
+
+        self.dirty_rects.append(self.get_rect())
         self.text = text
-        self.text_surface = self.font.render(self.text, True, self.color)
+        self.text_surface = font_cache.render(self.font, self.text, True, self.color)
+        self.dirty = True
 
 
     def draw_text(self, screen):
@@ -0,0 +1,378 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import FNaF7Python
+from modules.AssetCache import asset_cache
+from modules.AssetManager import asset_manager
+from modules.AssetPack import asset_pack
+from modules.FontCache import font_cache
+from modules.SoundBank import sound_bank
+from modules.PanoramaView import PanoramaView
+
+
+class CountingSurface(pygame.Surface):
+    blits = 0
+
+    def blit(self, *args, **kwargs):
+        CountingSurface.blits += 1
+        return super().blit(*args, **kwargs)
+
+    def fill(self, *args, **kwargs):
+        CountingSurface.blits += 1
+        return super().fill(*args, **kwargs)
+
+
+class ScriptedMouse:
+    def __init__(self) -> None:
+        self.pos = (0, 0)
+        self.pressed = False
+
+    def move(self, pos, pressed = False):
+        if pos != self.pos:
+            rel = (pos[0] - self.pos[0], pos[1] - self.pos[1])
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=rel, buttons=(int(self.pressed), 0, 0)))
+            self.pos = pos
+
+        if pressed != self.pressed:
+            event_type = pygame.MOUSEBUTTONDOWN if pressed else pygame.MOUSEBUTTONUP
+            pygame.event.post(pygame.event.Event(event_type, pos=pos, button=1))
+            self.pressed = pressed
+
+
+class BenchmarkGame(FNaF7Python.Game):
+    def __init__(self, resolution, cache_dir = None, logical = False, save_dir = None, workers = None, loader_mode = 'thread', panorama_quality = None) -> None:
+        if panorama_quality is not None:
+            self.PANORAMA_QUALITY = panorama_quality
+        self.LOADER_WORKERS = workers
+        self.LOADER_MODE = loader_mode
+        self.benchmark_resolution = resolution
+        self.benchmark_cache_dir = cache_dir
+        self.benchmark_save_dir = save_dir or tempfile.mkdtemp()
+        self.USE_LOGICAL_DISPLAY = logical
+        super().__init__()
+
+    def load_data(self):
+        data = super().load_data()
+        data['options'][0]['WIDTH'] = self.benchmark_resolution[0]
+        data['options'][0]['HEIGHT'] = self.benchmark_resolution[1]
+        data['options'][1]['FULLSCREEN'] = 0
+        return data
+
+    def init_office(self):
+        super().init_office()
+        if self.PANORAMA_QUALITY <= 0:
+            self.panorama = None
+            self.dispatcher.set_scroll_transform(None)
+
+    def init_game(self):
+        super().init_game()
+        if self.benchmark_cache_dir is not None:
+            asset_cache.set_directory(self.benchmark_cache_dir)
+
+        self.screen = CountingSurface(self.RESOLUTION, 0, self.screen)
+        self.renderer.screen = self.screen
+
+    def get_config_path(self):
+        return os.path.join(self.benchmark_save_dir, "config.json")
+
+    def get_save_path(self):
+        return os.path.join(self.benchmark_save_dir, "save.json")
+
+    def get_font_paths_path(self):
+        return os.path.join(self.benchmark_save_dir, "fonts.json")
+
+    def get_wait_time(self):
+        return 0
+
+    def get_night_levels(self):
+        return {}
+
+    def update(self):
+        pass
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def run_frames(game, mouse, script):
+    frame_times = []
+    blits = []
+    dirty = []
+    for pos, pressed in script:
+        mouse.move((int(pos[0] * game.RESOLUTION[0] / 1920), int(pos[1] * game.RESOLUTION[1] / 1080)), pressed)
+
+        CountingSurface.blits = 0
+        start = time.perf_counter()
+        game.step()
+        frame_times.append((time.perf_counter() - start) * 1000.0)
+        blits.append(CountingSurface.blits)
+        dirty.append(game.renderer.last_dirty_area)
+
+    return {
+        'frames': len(frame_times),
+        'mean_ms': sum(frame_times) / len(frame_times),
+        'p50_ms': percentile(frame_times, 0.50),
+        'p90_ms': percentile(frame_times, 0.90),
+        'p99_ms': percentile(frame_times, 0.99),
+        'max_ms': max(frame_times),
+        'blits_per_frame': sum(blits) / len(blits),
+        'dirty_area_per_frame': sum(dirty) / len(dirty),
+    }
+
+
+def click(pos, hold = 2, release = 2):
+    return [(pos, True)] * hold + [(pos, False)] * release
+
+
+def menu_hover_sweep(frames):
+    script = []
+    for i in range(frames):
+        y = 380 + (i * 7) % 640
+        script.append(((150, y), False))
+    return script
+
+
+def options_toggling(frames):
+    script = []
+    targets = [(280, 430), (220, 430), (280, 330), (220, 330), (250, 230)]
+    while len(script) < frames:
+        for target in targets:
+            script += click(target)
+            script += [((1000, 600), False)] * 4
+    return script[:frames]
+
+
+def office_scrolling(frames):
+    half = frames // 2
+    return [((20, 540), False)] * half + [((1900, 540), False)] * (frames - half)
+
+
+def camera_flip(frames):
+    script = []
+    while len(script) < frames:
+        script += [((960, 1040), False)] * 30
+        script += [((960, 600), False)] * 30
+    return script[:frames]
+
+
+def camera_switching(frames):
+    script = [((960, 1040), False)] * 60
+    cameras = FNaF7Python.Game.CAMERAS
+    index = 0
+    while len(script) < frames:
+        x, y = cameras[index % len(cameras)]['map']
+        script += click((x + 40, y + 20)) + [((x + 40, y + 20), False)] * 16
+        index += 1
+    return script[:frames]
+
+
+def measure_panorama(game, frames, qualities = (1.0, 0.5, 0.25)):
+    if not PanoramaView.is_available() or 'Game' not in game.loaded_states:
+        return {}
+
+    game.office.set_visible(True)
+    office_x = game.office.x
+    scroll = max(1, int(game.office.base_rect.width - game.screen.get_width()))
+
+    views = [(str(quality), quality, None) for quality in qualities]
+    if game.PANORAMA_MOTION_QUALITY is not None and game.PANORAMA_MOTION_QUALITY < game.PANORAMA_QUALITY:
+        views.append((f"{game.PANORAMA_QUALITY}/{game.PANORAMA_MOTION_QUALITY}", game.PANORAMA_QUALITY, game.PANORAMA_MOTION_QUALITY))
+
+    results = {'budget_ms': 1000.0 / game.fps}
+    for name, quality, motion_quality in views:
+        panorama = PanoramaView(game.RESOLUTION, game.PANORAMA_STRENGTH, quality, motion_quality)
+        times = []
+        settles = []
+        key = 0
+        for i in range(frames):
+            if i % 30 == 29:
+                start = time.perf_counter()
+                panorama.draw(game.screen, game.office, key)
+                settles.append((time.perf_counter() - start) * 1000.0)
+                continue
+            key += 1
+            game.office.x = -(key * 13 % scroll)
+            start = time.perf_counter()
+            panorama.draw(game.screen, game.office, key)
+            times.append((time.perf_counter() - start) * 1000.0)
+
+        redraws = []
+        for i in range(frames):
+            start = time.perf_counter()
+            panorama.draw(game.screen, game.office, key)
+            redraws.append((time.perf_counter() - start) * 1000.0)
+
+        results[name] = {'mean_ms': sum(times) / len(times), 'p99_ms': percentile(times, 0.99),
+                         'settle_ms': sum(settles) / len(settles) if settles else 0.0, 'redraw_ms': sum(redraws) / len(redraws)}
+
+    game.office.x = office_x
+    return results
+
+
+def measure_saves(game, count):
+    latencies = []
+    for i in range(count):
+        game.volume = i % 100
+        start = time.perf_counter()
+        game.save_data()
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+    start = time.perf_counter()
+    game.saves.flush()
+    flush_ms = (time.perf_counter() - start) * 1000.0
+
+    start = time.perf_counter()
+    game.saves.write_atomic(game.get_config_path(), json.dumps(game.data))
+    sync_ms = (time.perf_counter() - start) * 1000.0
+
+    stats = game.saves.get_stats()
+    return {
+        'saves': count,
+        'main_p50_ms': percentile(latencies, 0.50),
+        'main_p99_ms': percentile(latencies, 0.99),
+        'main_max_ms': max(latencies),
+        'flush_ms': flush_ms,
+        'synchronous_write_ms': sync_ms,
+        'writes': stats['writes'],
+        'coalesced': stats['coalesced'],
+    }
+
+
+SCENARIOS = [
+    ('menu_hover_sweep', 'MainMenu', menu_hover_sweep),
+    ('options_toggling', 'Options', options_toggling),
+    ('office_scrolling', 'Game', office_scrolling),
+    ('camera_flip', 'Game', camera_flip),
+    ('camera_switching', 'Game', camera_switching),
+]
+
+
+def run_benchmark(resolution, frames, cache_dir, logical = False, save_dir = None, workers = None, loader_mode = 'thread', panorama_quality = None):
+    mouse = ScriptedMouse()
+
+    results = {'resolution': list(resolution), 'logical': logical, 'frames_per_scenario': frames, 'scenarios': {}}
+
+    start = time.perf_counter()
+    game = BenchmarkGame(resolution, cache_dir, logical, save_dir, workers, loader_mode, panorama_quality)
+    results['loader'] = {'workers': game.loader.workers, 'mode': game.loader.mode}
+    results['startup_ms'] = (time.perf_counter() - start) * 1000.0
+
+    for name, state, script in SCENARIOS:
+        game.state = state
+        if state == 'Game':
+            game.in_cameras = False
+            start = time.perf_counter()
+            game.loader.prefetch('Game')
+            while not game.load_state('Game'):
+                time.sleep(0.001)
+            results.setdefault('game_load_ms', (time.perf_counter() - start) * 1000.0)
+            game.cam_button.value = 0
+            game.cameras.reset()
+
+        mouse.move((0, 0))
+        game.step()
+        asset_manager.store.flush()
+        results['scenarios'][name] = run_frames(game, mouse, script(frames))
+
+    results['panorama_quality'] = game.PANORAMA_QUALITY if game.panorama is not None else 0
+    asset_manager.store.flush()
+    results['panorama'] = measure_panorama(game, frames)
+    results['saves'] = measure_saves(game, 50)
+
+    results['asset_load_ms'] = {os.path.basename(path): seconds * 1000.0 for (path, scale, alpha), seconds in asset_manager.load_times.items()}
+    results['asset_cache'] = {'hits': asset_cache.hits, 'misses': asset_cache.misses}
+    results['font_cache'] = font_cache.get_stats()
+    results['sound_bank'] = sound_bank.get_stats()
+    results['surface_store'] = asset_manager.store.get_stats()
+    results['asset_pack'] = asset_pack.get_stats()
+    results['feed_cache'] = game.cameras.feeds.get_stats()
+    return results
+
+
+def compare(results, baseline, threshold, min_delta_ms = 0.05):
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+
+        for metric in ('p50_ms', 'p99_ms', 'blits_per_frame'):
+            if previous[metric] <= 0:
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric]
+            marker = ''
+            noise = metric.endswith('_ms') and current[metric] - previous[metric] < min_delta_ms
+            if change > threshold and not noise:
+                marker = '  REGRESSION'
+                regressions.append(f"{name}.{metric}")
+            print(f"{name:20} {metric:16} {previous[metric]:9.3f} -> {current[metric]:9.3f} ({change * 100:+6.1f}%){marker}")
+
+    return regressions
+
+
+def print_results(results):
+    print(f"resolution {results['resolution'][0]}x{results['resolution'][1]}, startup {results['startup_ms']:.1f} ms, game load {results.get('game_load_ms', 0):.1f} ms "
+          f"({results['loader']['workers']} {results['loader']['mode']} workers)")
+    for name, stats in results['scenarios'].items():
+        print(f"{name:20} p50 {stats['p50_ms']:7.3f} ms  p90 {stats['p90_ms']:7.3f} ms  p99 {stats['p99_ms']:7.3f} ms  max {stats['max_ms']:7.3f} ms  blits/frame {stats['blits_per_frame']:5.2f}")
+    for quality, stats in results['panorama'].items():
+        if quality != 'budget_ms':
+            budget = results['panorama']['budget_ms']
+            print(f"{'panorama ' + quality:20} mean {stats['mean_ms']:7.3f} ms  p99 {stats['p99_ms']:7.3f} ms  settle {stats.get('settle_ms', 0):7.3f} ms  "
+                  f"redraw {stats['redraw_ms']:7.3f} ms  ({'within' if stats['p99_ms'] <= budget else 'over'} the {budget:.2f} ms frame budget at p99)")
+    saves = results['saves']
+    print(f"{'saves':20} main p50 {saves['main_p50_ms']:7.3f} ms  p99 {saves['main_p99_ms']:7.3f} ms  max {saves['main_max_ms']:7.3f} ms  "
+          f"sync write {saves['synchronous_write_ms']:7.3f} ms  {saves['writes']} writes for {saves['saves']} saves")
+    feeds = results['feed_cache']
+    print(f"{'feed_cache':20} {feeds['feeds']} feeds  {feeds['resident_bytes'] / 1048576:6.1f} MB of {feeds['budget'] / 1048576:.0f} MB  "
+          f"hit rate {feeds['hit_rate'] * 100:5.1f}%  {feeds['misses']} misses  {feeds['evictions']} evictions  {feeds['prefetches']} prefetches")
+    for name, ms in sorted(results['asset_load_ms'].items(), key=lambda item: -item[1]):
+        print(f"{ms:9.2f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmark of the FNaF 7 Python render loop.")
+    parser.add_argument('--resolution', default='1920x1080')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--cold', action='store_true', help="use an empty asset cache")
+    parser.add_argument('--logical', action='store_true', help="render at 1920x1080 through the scaled logical display")
+    parser.add_argument('--workers', type=int, help="asset loader pool size, 1 loads serially (default: CPU count)")
+    parser.add_argument('--loader-mode', choices=('thread', 'process'), default='thread')
+    parser.add_argument('--panorama-quality', type=float, help="office panorama warp resolution factor for the scenarios, 0 disables it")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--baseline', help="compare against a previous JSON result")
+    parser.add_argument('--threshold', type=float, default=0.10, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    resolution = tuple(int(value) for value in args.resolution.lower().split('x'))
+
+    with tempfile.TemporaryDirectory() as cold_dir, tempfile.TemporaryDirectory() as save_dir:
+        results = run_benchmark(resolution, args.frames, cold_dir if args.cold else None, args.logical, save_dir, args.workers, args.loader_mode, args.panorama_quality)
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import json
+import argparse
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+UI_SPRITES = [
+    'new_game.png', 'new_game_hover.png',
+    'continue.png', 'continue_hover.png',
+    'options.png', 'options_hover.png',
+    'extras.png', 'extras_hover.png',
+    'custom_night.png', 'custom_night_hover.png',
+    'exit.png', 'exit_hover.png',
+    'credits.png', 'credits_hover.png',
+    'blank.png', 'blank_l.png', 'blank_r.png', 'blank_x.png',
+    'cam_button.png',
+]
+
+
+def pack(sizes, max_width, padding):
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+
+    regions = [None] * len(sizes)
+    x = y = shelf_height = width = 0
+    for i in order:
+        w, h = sizes[i]
+        if x > 0 and x + w + padding > max_width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+
+        regions[i] = (x + padding, y + padding, w, h)
+        x += w + padding
+        shelf_height = max(shelf_height, h + padding)
+        width = max(width, x + padding)
+
+    return regions, (width, y + shelf_height + padding)
+
+
+def trim(image):
+    bbox = image.get_bounding_rect(1)
+    if bbox.width == 0 or bbox.height == 0:
+        bbox = pygame.Rect(0, 0, 1, 1)
+    return image.subsurface(bbox), bbox.topleft
+
+
+def build(directory, names, output, max_width = 2048, padding = 2, trimmed = True):
+    images = [pygame.image.load(os.path.join(directory, name)) for name in names]
+    offsets = {}
+    if trimmed:
+        for i, name in enumerate(names):
+            images[i], offset = trim(images[i])
+            if offset != (0, 0):
+                offsets[name] = list(offset)
+    regions, size = pack([image.get_size() for image in images], max_width, padding)
+
+    atlas = pygame.Surface(size, pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    for image, region in zip(images, regions):
+        atlas.blit(image, region[:2])
+
+    image_name = output + '.png'
+    pygame.image.save(atlas, os.path.join(directory, image_name))
+
+    index = {
+        'image': image_name,
+        'size': list(size),
+        'regions': {name: list(region) for name, region in zip(names, regions)},
+        'offsets': offsets,
+    }
+    with open(os.path.join(directory, output + '.json'), 'w') as f:
+        json.dump(index, f, indent=2)
+
+    source_bytes = sum(os.path.getsize(os.path.join(directory, name)) for name in names)
+    print(f"Packed {len(names)} sprites ({len(offsets)} trimmed) into {size[0]}x{size[1]} '{image_name}' ({os.path.getsize(os.path.join(directory, image_name))} bytes, sources {source_bytes} bytes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the small UI sprites into a texture atlas with a JSON region index.")
+    parser.add_argument('--assets', default=os.path.join(ROOT, 'assets'))
+    parser.add_argument('--output', default='ui_atlas', help="base name of the atlas image and index")
+    parser.add_argument('--max-width', type=int, default=2048)
+    parser.add_argument('--padding', type=int, default=2)
+    parser.add_argument('--no-trim', action='store_true', help="pack the sprites untrimmed instead of cutting their transparent borders")
+    args = parser.parse_args()
+
+    pygame.init()
+    build(args.assets, UI_SPRITES, args.output, args.max_width, args.padding, not args.no_trim)
+
+
+if __name__ == "__main__":
+    main()
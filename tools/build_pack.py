@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import zlib
+import time
+import argparse
+import subprocess
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from modules.AssetPack import AssetPack, asset_pack
+from modules.AssetCache import asset_cache
+from modules.AssetManager import asset_manager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def align(value, alignment):
+    return (value + alignment - 1) // alignment * alignment
+
+
+def build(root, directory, output, compress = 'none', threshold = 0.25):
+    entries = []
+    paths = [os.path.join(folder, name) for folder, _, names in os.walk(os.path.join(root, directory)) for name in names]
+    for path in sorted(paths):
+        if not path.endswith('.png'):
+            continue
+
+        key = os.path.relpath(path, root).replace(os.sep, '/')
+        image = pygame.image.load(path)
+        data = pygame.image.tobytes(image, 'BGRA')
+        mode, value = asset_manager.get_alpha_mode(image)
+
+        entry = {'size': list(image.get_size()), 'format': 'BGRA', 'alpha_mode': mode, 'alpha_value': value, 'compression': 'none'}
+        if compress != 'none':
+            packed = zlib.compress(data, 1)
+            if compress == 'all' or len(packed) < len(data) * threshold:
+                data = packed
+                entry['compression'] = 'zlib'
+
+        entry['length'] = len(data)
+        entries.append((key, entry, data))
+
+    index = {key: entry for key, entry, _ in entries}
+    index_size = 0
+    while True:
+        offset = align(AssetPack.HEADER.size + index_size, AssetPack.ALIGNMENT)
+        for key, entry, data in entries:
+            entry['offset'] = offset
+            offset = align(offset + len(data), AssetPack.ALIGNMENT)
+
+        index_bytes = json.dumps(index, separators=(',', ':')).encode()
+        if len(index_bytes) == index_size:
+            break
+        index_size = len(index_bytes)
+
+    temp_path = output + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(AssetPack.HEADER.pack(AssetPack.MAGIC, AssetPack.VERSION, index_size))
+        f.write(index_bytes)
+        for key, entry, data in entries:
+            f.seek(entry['offset'])
+            f.write(data)
+        f.truncate(offset)
+    os.replace(temp_path, output)
+
+    compressed = sum(1 for _, entry, _ in entries if entry['compression'] == 'zlib')
+    print(f"Packed {len(entries)} images into '{output}' ({os.path.getsize(output) / 1048576:.1f} MB, {compressed} compressed)")
+
+
+def get_memory():
+    memory = {}
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith(('VmRSS', 'RssAnon', 'RssFile')):
+                    name, value = line.split(':')
+                    memory[name] = int(value.split()[0]) * 1024
+    except OSError:
+        import resource
+        memory['VmRSS'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return memory
+
+
+def measure(root, pack_path):
+    pygame.display.init()
+    pygame.display.set_mode((1920, 1080))
+
+    if pack_path is not None:
+        asset_pack.open(pack_path)
+        asset_cache.set_pack(asset_pack)
+
+    names = sorted(name for name in os.listdir(os.path.join(root, 'assets')) if name.endswith('.png'))
+
+    before = get_memory()
+    start = time.perf_counter()
+    surfaces = [asset_manager.acquire(os.path.join(root, 'assets', name), (1.0, 1.0), 'auto') for name in names]
+    seconds = time.perf_counter() - start
+    after = get_memory()
+
+    start = time.perf_counter()
+    screen = pygame.display.get_surface()
+    for surface in surfaces:
+        screen.blit(surface, (0, 0))
+    blit_seconds = time.perf_counter() - start
+
+    return {
+        'images': len(surfaces),
+        'load_ms': seconds * 1000.0,
+        'blit_ms': blit_seconds * 1000.0,
+        'memory_delta': {name: after[name] - before.get(name, 0) for name in after},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack every PNG under assets/ (including the optimized/ images) into one memory-mapped pack file, or compare loading it against loose PNGs.")
+    parser.add_argument('--assets', default='assets', help="asset directory, relative to the project root")
+    parser.add_argument('--output', default=os.path.join(ROOT, 'assets.pack'))
+    parser.add_argument('--compress', choices=('none', 'auto', 'all'), default='none',
+                        help="zlib-compress blobs (auto: only when smaller than --threshold of the raw size); compressed blobs are inflated on load instead of mapped")
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--measure', action='store_true', help="load every image from loose PNGs and from the pack in fresh processes and compare")
+    parser.add_argument('--measure-child', choices=('loose', 'pack'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure_child:
+        results = measure(ROOT, args.output if args.measure_child == 'pack' else None)
+        print(json.dumps(results))
+        return None
+
+    if not args.measure:
+        pygame.init()
+        build(ROOT, args.assets, args.output, args.compress, args.threshold)
+        return None
+
+    if not os.path.exists(args.output):
+        raise SystemExit(f"No pack at '{args.output}', build it first")
+
+    for mode in ('loose', 'pack'):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--output', args.output, '--measure-child', mode],
+                                check=True, capture_output=True, text=True).stdout
+        results = json.loads(output.strip().splitlines()[-1])
+        memory = '  '.join(f"{name} {value / 1048576:+7.1f} MB" for name, value in sorted(results['memory_delta'].items()))
+        print(f"{mode:6} {results['images']} images  load {results['load_ms']:8.1f} ms  first blits {results['blit_ms']:7.1f} ms  {memory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import os
+import json
+import argparse
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLORKEYS = [(255, 0, 255), (0, 255, 0), (0, 255, 255), (255, 255, 0), (1, 2, 3)]
+
+
+def get_atlas_images(directory):
+    names = set()
+    for name in os.listdir(directory):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name), 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if isinstance(index, dict) and 'image' in index and 'regions' in index:
+            names.add(index['image'])
+    return names
+
+
+def find_colorkey(image):
+    for key in COLORKEYS:
+        if pygame.mask.from_threshold(image, key + (255,), (1, 1, 1, 1)).count() == 0:
+            return key
+    return None
+
+
+def analyse(image):
+    bbox = image.get_bounding_rect(1)
+    if bbox.width == 0 or bbox.height == 0:
+        bbox = pygame.Rect(0, 0, 1, 1)
+
+    trimmed = image.subsurface(bbox)
+    area = bbox.width * bbox.height
+    opaque = pygame.mask.from_surface(trimmed, 254).count()
+    visible = pygame.mask.from_surface(trimmed, 0).count()
+
+    if opaque == area:
+        return bbox, 'opaque', None
+
+    if opaque == visible:
+        key = find_colorkey(trimmed)
+        if key is not None:
+            return bbox, 'colorkey', list(key)
+
+    alpha = trimmed.get_at((0, 0)).a
+    if alpha > 0 and visible == area and pygame.mask.from_surface(trimmed, alpha - 1).count() == area and pygame.mask.from_surface(trimmed, alpha).count() == 0:
+        return bbox, 'uniform', alpha
+
+    return bbox, 'alpha', None
+
+
+def encode(trimmed, mode, value):
+    if mode == 'alpha':
+        return trimmed.copy()
+
+    output = pygame.image.frombuffer(pygame.image.tobytes(trimmed, 'RGB'), trimmed.get_size(), 'RGB').copy()
+    if mode == 'colorkey':
+        transparent = pygame.mask.from_surface(trimmed, 0)
+        transparent.invert()
+        transparent.to_surface(output, setcolor=value, unsetcolor=None)
+    return output
+
+
+def optimise(directory, output, write = True):
+    skipped = get_atlas_images(directory)
+    index = {'version': 1, 'images': {}}
+    report = []
+
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.png') or name in skipped:
+            continue
+
+        image = pygame.image.load(os.path.join(directory, name))
+        bbox, mode, value = analyse(image)
+        width, height = image.get_size()
+        trimmed = bbox.size != (width, height)
+
+        report.append({
+            'name': name,
+            'size': [width, height],
+            'trimmed': [bbox.width, bbox.height],
+            'mode': mode,
+            'pixels_saved': width * height - bbox.width * bbox.height,
+            'bytes_saved': (width * height - bbox.width * bbox.height) * 4,
+        })
+
+        if mode == 'alpha' and not trimmed:
+            continue
+
+        entry = {'image': name, 'size': [width, height], 'offset': [bbox.x, bbox.y], 'mode': mode, 'value': value}
+        if trimmed or mode == 'colorkey':
+            entry['image'] = f"{output}/{name}"
+            if write:
+                os.makedirs(os.path.join(directory, output), exist_ok=True)
+                pygame.image.save(encode(image.subsurface(bbox), mode, value), os.path.join(directory, output, name))
+        index['images'][name] = entry
+
+    if write:
+        with open(os.path.join(directory, output + '.json'), 'w') as f:
+            json.dump(index, f, indent=2)
+
+    return index, report
+
+
+def print_report(report):
+    for item in report:
+        percent = item['pixels_saved'] * 100.0 / (item['size'][0] * item['size'][1])
+        print(f"{item['name']:28} {item['size'][0]:5}x{item['size'][1]:<5} -> {item['trimmed'][0]:5}x{item['trimmed'][1]:<5} {item['mode']:9} "
+              f"{item['pixels_saved']:9} px ({percent:5.1f}%)  {item['bytes_saved'] / 1048576:7.2f} MB saved")
+
+    pixels = sum(item['size'][0] * item['size'][1] for item in report)
+    saved = sum(item['pixels_saved'] for item in report)
+    modes = {}
+    for item in report:
+        modes[item['mode']] = modes.get(item['mode'], 0) + 1
+    print(f"{len(report)} images, {saved} of {pixels} pixels trimmed ({saved * 4 / 1048576:.2f} MB at 32 bpp), "
+          + ', '.join(f"{count} {mode}" for mode, count in sorted(modes.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trim transparent borders off the PNG assets and record the cheapest surface format for each.")
+    parser.add_argument('--assets', default=os.path.join(ROOT, 'assets'))
+    parser.add_argument('--output', default='optimized', help="directory for rewritten images and base name of the JSON index")
+    parser.add_argument('--dry-run', action='store_true', help="only print the report")
+    parser.add_argument('--json', help="also write the report to this file")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    index, report = optimise(args.assets, args.output, not args.dry_run)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy
+from modules.NightSimulation import NightSimulation
+
+
+class ScriptedPolicy:
+    def __init__(self, sim, awareness : float = 0.5, camera_period : float = 12.0, camera_look : float = 2.0,
+                 cameras = ('dining_area',), seed = None) -> None:
+        self.rng = numpy.random.default_rng(seed)
+
+        self.notice_chance = 1.0 - (1.0 - awareness) ** (1.0 / sim.tick_rate)
+        self.camera_period = max(1, int(camera_period * sim.tick_rate))
+        self.camera_look = int(camera_look * sim.tick_rate)
+        self.cameras = [sim.room_index[room] for room in cameras]
+
+        self.occupancy = numpy.zeros((sim.nights, len(sim.DEFENSES)), dtype=bool)
+        self.notice_at = numpy.full((sim.nights, len(sim.DEFENSES)), -1, dtype=numpy.int64)
+        self.notice_ticks = set()
+
+        offsets = self.rng.integers(0, self.camera_period, sim.nights)
+        self.groups = [numpy.flatnonzero(offsets == offset) for offset in range(self.camera_period)]
+        self.camera = numpy.full(sim.nights, -1, dtype=numpy.int16)
+
+    def __call__(self, sim):
+        closed = None
+        occupancy = sim.get_entry_occupancy()
+        if occupancy is not self.occupancy:
+            arrived = occupancy & ~self.occupancy
+            delays = sim.tick_count + self.rng.geometric(self.notice_chance, int(arrived.sum()))
+            self.notice_at[arrived] = delays
+            self.notice_ticks.update(delays.tolist())
+            self.occupancy = occupancy
+            closed = True
+
+        if sim.tick_count in self.notice_ticks:
+            self.notice_ticks.discard(sim.tick_count)
+            closed = True
+
+        if closed is not None:
+            closed = self.occupancy & (self.notice_at <= sim.tick_count)
+
+        camera = None
+        if self.camera_look > 0:
+            offset = -sim.tick_count % self.camera_period
+            looking = self.groups[offset]
+            leaving = self.groups[(self.camera_look - sim.tick_count) % self.camera_period]
+            if len(looking) or len(leaving):
+                self.camera[leaving] = -1
+                self.camera[looking] = self.cameras[(sim.tick_count + offset) // self.camera_period % len(self.cameras)]
+                camera = self.camera
+
+        if closed is not None or camera is not None:
+            sim.set_controls(closed, camera)
+
+
+def parse_levels(values, names):
+    levels = {}
+    for value in values or []:
+        name, _, level = value.partition('=')
+        if name not in names:
+            raise SystemExit(f"Unknown animatronic '{name}', expected one of {', '.join(names)}")
+        levels[name] = int(level)
+    return levels
+
+
+def simulate(levels, args, seed):
+    sim = NightSimulation(levels, tick_rate=args.tick_rate, nights=len(levels) if not isinstance(levels, dict) else args.nights,
+                          hour_seconds=args.hour_seconds, seed=seed)
+    policy = ScriptedPolicy(sim, args.awareness, args.camera_period, args.camera_look, seed=seed)
+
+    start = time.perf_counter()
+    sim.run(policy)
+    return sim, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run batches of nights headlessly against a scripted player to tune AI levels.")
+    parser.add_argument('--nights', type=int, default=10000, help="simulated nights per level setting")
+    parser.add_argument('--night', type=int, default=1, choices=sorted(NightSimulation.NIGHT_PRESETS), help="start from this night's AI levels")
+    parser.add_argument('--level', action='append', metavar='NAME=LEVEL', help="override one animatronic's AI level (repeatable)")
+    parser.add_argument('--sweep', metavar='NAME', help="sweep NAME's AI level over 0-20 and report the survival curve")
+    parser.add_argument('--tick-rate', type=int, default=10, help="simulation ticks per second (the game uses its own tick rate)")
+    parser.add_argument('--hour-seconds', type=float, default=60.0)
+    parser.add_argument('--awareness', type=float, default=0.5, help="chance per second to notice an animatronic at an entry and close it")
+    parser.add_argument('--camera-period', type=float, default=12.0)
+    parser.add_argument('--camera-look', type=float, default=2.0)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    names = [animatronic['name'] for animatronic in NightSimulation.ANIMATRONICS]
+    levels = dict(NightSimulation.NIGHT_PRESETS[args.night])
+    levels.update(parse_levels(args.level, names))
+
+    if args.sweep is None:
+        sim, seconds = simulate(levels, args, args.seed)
+        results = {'levels': levels, 'seconds': seconds, **sim.get_stats()}
+
+        print(f"{args.nights} nights at {levels} in {seconds:.2f} s")
+        print(f"  survival {results['survival_rate'] * 100:.1f}%, mean power left {results['mean_power_left']:.1f}%")
+        print(f"  deaths {results['deaths']}")
+    else:
+        if args.sweep not in names:
+            raise SystemExit(f"Unknown animatronic '{args.sweep}', expected one of {', '.join(names)}")
+
+        row = numpy.array([levels.get(name, 0) for name in names], dtype=numpy.int8)
+        grid = numpy.tile(row, (21 * args.nights, 1))
+        grid[:, names.index(args.sweep)] = numpy.repeat(numpy.arange(21), args.nights)
+
+        sim, seconds = simulate(grid, args, args.seed)
+        survived = sim.get_survived().reshape(21, args.nights).mean(axis=1)
+        results = {'levels': levels, 'sweep': args.sweep, 'seconds': seconds, 'survival_curve': survived.tolist()}
+
+        print(f"{21 * args.nights} nights sweeping {args.sweep} over 0-20 in {seconds:.2f} s")
+        for level, rate in enumerate(survived):
+            print(f"  {args.sweep} {level:>2}: {rate * 100:5.1f}% {'#' * int(rate * 40)}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
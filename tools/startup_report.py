@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(command, report_path, env):
+    if os.path.exists(report_path):
+        os.remove(report_path)
+
+    subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+
+    with open(report_path, 'r') as f:
+        return json.load(f)
+
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the startup timeline (import, init, first frame, menu ready) over several launches.")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--executable', help="frozen build to launch instead of the script, e.g. dist/FNaF7Python/FNaF7Python")
+    parser.add_argument('--headless', action='store_true', help="use SDL's dummy video and audio drivers")
+    parser.add_argument('--cold-fonts', action='store_true', help="delete the font path cache before every run")
+    parser.add_argument('--output', help="write the per-phase medians as JSON to this file")
+    args = parser.parse_args()
+
+    if args.executable:
+        command = [os.path.abspath(args.executable), '--startup-report']
+        data_dir = os.path.dirname(command[0])
+    else:
+        command = [sys.executable, os.path.join(ROOT, 'FNaF7Python.py'), '--startup-report']
+        data_dir = ROOT
+
+    env = dict(os.environ)
+    if args.headless:
+        env['SDL_VIDEODRIVER'] = 'dummy'
+        env['SDL_AUDIODRIVER'] = 'dummy'
+
+    reports = []
+    for _ in range(args.runs):
+        if args.cold_fonts and os.path.exists(os.path.join(data_dir, 'fonts.json')):
+            os.remove(os.path.join(data_dir, 'fonts.json'))
+        reports.append(run_once(command, os.path.join(data_dir, 'startup.json'), env))
+
+    phases = {}
+    for name in reports[0]['phases']:
+        phases[name] = {
+            'at_ms': median([report['phases'][name]['at_ms'] for report in reports if name in report['phases']]),
+            'phase_ms': median([report['phases'][name]['phase_ms'] for report in reports if name in report['phases']]),
+        }
+
+    results = {key: value for key, value in reports[-1].items() if key not in ('phases', 'total_ms')}
+    results.update({'runs': args.runs, 'phases': phases})
+
+    print(f"{args.runs} launches of {' '.join(command[:2] if not args.executable else command[:1])} (frozen: {results['frozen']})")
+    for name, phase in phases.items():
+        print(f"{name:16} {phase['at_ms']:9.2f} ms  (+{phase['phase_ms']:.2f} ms)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()